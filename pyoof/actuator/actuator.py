@@ -13,8 +13,9 @@ from astropy import constants
 from astropy import units as apu
 from astropy.table import QTable
 from astropy.utils.data import get_pkg_data_filename
-from scipy import interpolate, optimize
-from ..aperture import phase
+from scipy import interpolate
+from ..math_functions import cart2pol
+from ..zernike import U_stack
 
 __all__ = ['EffelsbergActuator']
 
@@ -99,6 +100,61 @@ class EffelsbergActuator():
         self.alpha_lookup, self.actuator_sr_lookup = self.read_lookup(True)
         self.phase_pr_lookup = self.transform(self.actuator_sr_lookup)
 
+        # Zernike circle polynomials basis, computed once on first use
+        self._basis = None
+        self._basis_pinv = {}
+
+    def _zpoly_basis(self):
+        """
+        Zernike circle polynomials basis for the primary dish, in the same
+        grid as `~pyoof.aperture.phase`. Each row is one polynomial,
+        multiplied by :math:`2\\pi` and flattened, so that a phase-error map
+        is simply ``K_coeff @ basis``. It is computed once and cached.
+
+        Returns
+        -------
+        basis : `~numpy.ndarray`
+            Zernike circle polynomials basis, with shape ``(N_K_coeff,
+            resolution ** 2)``.
+        """
+
+        if self._basis is None:
+            x = np.linspace(-self.pr, self.pr, self.resolution)
+            xx, yy = np.meshgrid(x, x)
+            r, t = cart2pol(xx, yy)
+
+            basis = U_stack(
+                self.n, (r / self.pr).to_value(apu.one), t.to_value(apu.rad)
+                )
+            basis[:, r > self.pr] = 0
+            basis *= 2 * np.pi
+
+            self._basis = basis.reshape(self.N_K_coeff, -1)
+
+        return self._basis
+
+    def _zpoly_pinv(self, n_removed):
+        """
+        Pseudo-inverse of the Zernike circle polynomials basis,
+        `~pyoof.actuator.EffelsbergActuator._zpoly_basis`, without its first
+        ``n_removed`` polynomials. The least squares solution for a set of
+        phase-error maps is then ``phase_data @ pinv``. It is computed once
+        per ``n_removed`` and cached.
+
+        Returns
+        -------
+        pinv : `~numpy.ndarray`
+            Pseudo-inverse with shape ``(resolution ** 2, N_K_coeff -
+            n_removed)``.
+        """
+
+        if n_removed not in self._basis_pinv:
+            self._basis_pinv[n_removed] = np.linalg.pinv(
+                self._zpoly_basis()[n_removed:, :]
+                )
+
+        return self._basis_pinv[n_removed]
+
     def read_lookup(self, interp):
         """
         Simple reader for the Effelsberg active surface look-up table.
@@ -138,30 +194,33 @@ class EffelsbergActuator():
             # Generating new grid same as pyoof output
             x_ng = np.linspace(-self.sr, self.sr, self.resolution)
             y_ng = x_ng.copy()
-            xx, yy = np.meshgrid(x_ng, y_ng)
-            circ = [(xx ** 2 + yy ** 2) >= (self.sr) ** 2]
+            # broadcasting views instead of a full meshgrid
+            xx, yy = x_ng[np.newaxis, :], y_ng[:, np.newaxis]
+            circ = (xx ** 2 + yy ** 2) >= (self.sr) ** 2
+
+            # one triangulation for all the look-up table angles, same as
+            # the cubic method in griddata
+            interp_lookup = interpolate.CloughTocher2DInterpolator(
+                # coordinates of grid points to interpolate from
+                points=np.column_stack(
+                    (self.act_x.to_value(apu.m), self.act_y.to_value(apu.m))
+                    ),
+                values=np.column_stack(
+                    [lookup_table[_alpha].to_value(apu.um)
+                        for _alpha in names[3:]]
+                    )
+                )
 
             # actuators displacement in the new grid
-            actuator_sr_lookup = np.zeros(
-                shape=(alpha_lookup.size, self.resolution, self.resolution)
-                ) << apu.um
-
-            for j, _alpha in enumerate(names[3:]):
-                actuator_sr_lookup[j, :, :] = interpolate.griddata(
-                    # coordinates of grid points to interpolate from
-                    points=(
-                        self.act_x.to_value(apu.m),
-                        self.act_y.to_value(apu.m)
-                        ),
-                    values=lookup_table[_alpha].to_value(apu.um),
-                    # coordinates of grid points to interpolate to
-                    xi=tuple(
-                        np.meshgrid(x_ng.to_value(apu.m), y_ng.to_value(apu.m))
-                        ),
-                    method='cubic'
-                    ) * apu.um
-                actuator_sr_lookup = np.nan_to_num(actuator_sr_lookup)
-                actuator_sr_lookup[j, :, :][tuple(circ)] = 0
+            # coordinates of grid points to interpolate to
+            actuator_sr_lookup = np.nan_to_num(
+                np.moveaxis(
+                    interp_lookup(xx.to_value(apu.m), yy.to_value(apu.m)),
+                    -1, 0
+                    )
+                )
+            actuator_sr_lookup[:, circ] = 0
+            actuator_sr_lookup = actuator_sr_lookup * apu.um
 
         else:
             actuator_sr_lookup = np.zeros(shape=(11, 96), dtype=int) << apu.um
@@ -227,13 +286,13 @@ class EffelsbergActuator():
         else:
             axes = (0, 1)
 
-        phase_pr = (
-            self.tfactor * np.rot90(
-                m=actuator_sr,
-                axes=axes,
-                k=self.nrot
-                )
-            ).to(apu.rad)
+        # unit conversion folded into the scalar, only one copy of the map
+        factor = (self.tfactor * actuator_sr.unit).to_value(apu.rad)
+        phase_pr = np.rot90(
+            m=actuator_sr.value,
+            axes=axes,
+            k=self.nrot
+            ) * factor << apu.rad
 
         return phase_pr
 
@@ -262,11 +321,13 @@ class EffelsbergActuator():
         else:
             axes = (0, 1)
 
+        # unit conversion folded into the scalar, only one copy of the map
+        factor = (phase_pr.unit / self.tfactor).to_value(apu.um)
         actuator_sr = np.rot90(
-            m=(phase_pr / self.tfactor).to(apu.um),
+            m=phase_pr.value * factor,
             axes=axes,
             k=-self.nrot
-            )
+            ) << apu.um
 
         # replacing larger values for maximum/minimum displacement
         [min_amplitude, max_amplitude] = self.limits_amplitude
@@ -300,21 +361,26 @@ class EffelsbergActuator():
         x = np.linspace(-self.sr, self.sr, self.resolution)
         y = x.copy()
 
-        lookup_table = np.zeros((11, 96)) << apu.um
+        # unit conversions done once, not per look-up table angle
+        x_mm = x.to_value(apu.mm)
+        y_mm = y.to_value(apu.mm)
+        act_x_mm = self.act_x.to_value(apu.mm)
+        act_y_mm = self.act_y.to_value(apu.mm)
+        actuator_sr_um = actuator_sr.to_value(apu.um)
+
+        lookup_table = np.zeros((11, 96))
         for j in range(11):
 
             intrp = interpolate.RectBivariateSpline(
-                x.to_value(apu.mm), y.to_value(apu.mm),
-                z=actuator_sr.to_value(apu.um)[j, :, :].T,
+                x_mm, y_mm,
+                z=actuator_sr_um[j, :, :].T,
                 kx=5,
                 ky=5
                 )
 
-            lookup_table[j, :] = intrp(
-                self.act_x.to_value(apu.mm),
-                self.act_y.to_value(apu.mm),
-                grid=False
-                ) * apu.um
+            lookup_table[j, :] = intrp(act_x_mm, act_y_mm, grid=False)
+
+        lookup_table = lookup_table << apu.um
 
         return lookup_table
 
@@ -347,13 +413,17 @@ class EffelsbergActuator():
         lookup_table[lookup_table < min_amplitude] = min_amplitude
         lookup_table = lookup_table.to_value(apu.um)
 
-        # writing the file row per row in specific format
+        # rounding all the table at once, rows are the actuators
+        lookup_int = np.around(lookup_table, 0).astype(np.int64).T.tolist()
+
+        # writing the file in one call in specific format
         with open(fname, 'w') as file:
-            for k in range(96):
-                row = np.around(
-                    lookup_table[:, k], 0).astype(np.int).astype(str)
-                file.write(f'NR {k + 1} ffff ' + '  '.join(tuple(row)) + '\n')
-            file.write('**ENDE**\n')
+            file.write(
+                ''.join(
+                    f'NR {k + 1} ffff ' + '  '.join(map(str, row)) + '\n'
+                    for k, row in enumerate(lookup_int)
+                    ) + '**ENDE**\n'
+                )
 
     def fit_zpoly(self, phase_pr, alpha, fem=True):
         """
@@ -384,44 +454,19 @@ class EffelsbergActuator():
         start_time = time.time()
         print('\n ***** PYOOF FIT POLYNOMIALS ***** \n')
 
+        # the phase-error is linear in K_coeff, phase_model = K_coeff @ basis
         if fem:
-            def residual_phase(K_coeff, phase_data):
-                phase_model = phase(
-                    K_coeff=np.insert(K_coeff, [0] * 3, [0.] * 3),
-                    pr=self.pr,
-                    piston=False,
-                    tilt=False,
-                    resolution=self.resolution
-                    )[2].to_value(apu.rad).flatten()
-                return phase_data - phase_model
-            K_coeff_init = np.array([0.1] * (self.N_K_coeff - 3))
-            K_coeff_alpha = np.zeros((alpha.size, self.N_K_coeff - 3))
-
+            n_removed = 3  # removing piston and tilt
         else:
-            def residual_phase(K_coeff, phase_data):
-                phase_model = phase(
-                    K_coeff=K_coeff,
-                    pr=self.pr,
-                    piston=False,
-                    tilt=True,
-                    resolution=self.resolution
-                    )[2].to_value(apu.rad).flatten()
-                return phase_data - phase_model
-            K_coeff_init = np.array([0.1] * self.N_K_coeff)
-            K_coeff_alpha = np.zeros((alpha.size, self.N_K_coeff))
-
-        for _alpha in range(alpha.size):
-            res_lsq_K = optimize.least_squares(
-                fun=residual_phase,
-                x0=K_coeff_init,
-                args=(phase_pr[_alpha, ...].to_value(apu.rad).flatten(),),
-                method='trf',
-                tr_solver='exact'
-                )
-            K_coeff_alpha[_alpha, :] = res_lsq_K.x
+            n_removed = 1  # removing piston
+
+        # all elevations are solved at once, one column per phase-error map
+        phase_data = phase_pr.to_value(apu.rad).reshape(alpha.size, -1)
+        K_coeff_alpha = phase_data @ self._zpoly_pinv(n_removed)
 
-        if K_coeff_alpha.shape[1] != self.N_K_coeff:
-            K_coeff_alpha = np.insert(K_coeff_alpha, [0] * 3, [0.] * 3, 1)
+        K_coeff_alpha = np.insert(
+            K_coeff_alpha, [0] * n_removed, [0.] * n_removed, 1
+            )
 
         final_time = np.round((time.time() - start_time) / 60, 2)
         print(f'\n ***** PYOOF FIT COMPLETED AT {final_time} mins *****\n')
@@ -455,22 +500,13 @@ class EffelsbergActuator():
         start_time = time.time()
         print('\n ***** PYOOF FIT GRAVITATIONAL DEFORMATION MODEL ***** \n')
 
-        def residual_grav_deformation(g_coeff, Knl, alpha):
-            Knl_model = self.grav_deformation(g_coeff, alpha)
-            return Knl - Knl_model
-
-        # removing tilt and amplitude (K(0, 0)) terms from fit
-        g_coeff = np.zeros((self.N_K_coeff, 3))
-        for N in range(self.N_K_coeff):
+        # the model is linear in g_coeff, K = [sin(alpha), cos(alpha), 1] @ g
+        if type(alpha) == apu.Quantity:
+            alpha = alpha.to_value(apu.rad)
+        A = np.column_stack((np.sin(alpha), np.cos(alpha), np.ones_like(alpha)))
 
-            res_lsq_g = optimize.least_squares(
-                fun=residual_grav_deformation,
-                x0=[0.1, 0.1, 0.1],
-                args=(K_coeff_alpha[:, N], alpha,),
-                method='trf',
-                tr_solver='exact'
-                )
-            g_coeff[N, :] = res_lsq_g.x
+        # all Zernike circle polynomial coefficients at once
+        g_coeff = np.linalg.lstsq(A, K_coeff_alpha, rcond=None)[0].T
 
         final_time = np.round((time.time() - start_time) / 60, 2)
         print(f'\n ***** PYOOF FIT COMPLETED AT {final_time} mins *****\n')
@@ -538,32 +574,27 @@ class EffelsbergActuator():
             ``(alpha.size, resolution, resolution)``.
         """
 
-        phases = np.zeros(
-            shape=(alpha.size, self.resolution, self.resolution)
-            ) << apu.rad
-
-        for a, _alpha in enumerate(alpha):
-
-            K_coeff = np.zeros((self.N_K_coeff))
-            for k in range(self.N_K_coeff):
+        if type(alpha) == apu.Quantity:
+            alpha = alpha.to_value(apu.rad)
+        alpha = np.atleast_1d(alpha)
 
-                K_coeff[k] = self.grav_deformation(
-                    g_coeff=g_coeff[k, :],
-                    alpha=_alpha
-                    )
+        # gravitational deformation model for all elevations at once
+        K_coeff_alpha = (
+            np.sin(alpha)[:, None] * g_coeff[:, 0] +
+            np.cos(alpha)[:, None] * g_coeff[:, 1] +
+            g_coeff[:, 2]
+            )
+        K_coeff_alpha[:, :3] = 0  # removing piston and tilt
 
-            phases[a, :, :] = phase(
-                K_coeff=K_coeff,
-                pr=self.pr,
-                piston=False,
-                tilt=False,
-                resolution=self.resolution
-                )[2]
+        # the phase-error is linear in K_coeff, same basis as in fit_zpoly
+        phases = (K_coeff_alpha @ self._zpoly_basis()).reshape(
+            alpha.size, self.resolution, self.resolution
+            )
 
-            if eac:
-                phases *= self.ellipsoidal_actuator_correction()
+        if eac:
+            phases *= self.ellipsoidal_actuator_correction()
 
-        return phases
+        return phases << apu.rad
 
     def ellipsoidal_actuator_correction(
         self, r=None, a=14.3050 * apu.m, b=7.3872 * apu.m
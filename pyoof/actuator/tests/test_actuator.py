@@ -63,3 +63,43 @@ def test_write_lookup(pyoof_tmp_dir):
 
     for line, line_true in zip(read_lines, read_lines_true):
         assert line == line_true
+
+
+def test_fit_zpoly():
+
+    actuator_low = EffelsbergActuator(order=n, resolution=100)
+    alpha = [10, 40, 80] * apu.deg
+
+    with NumpyRNGContext(0):
+        K_coeff_alpha_true = np.random.uniform(
+            -.1, .1, (alpha.size, actuator_low.N_K_coeff)
+            )
+    K_coeff_alpha_true[:, :3] = 0  # no piston and tilt
+
+    phase_pr = (
+        K_coeff_alpha_true @ actuator_low._zpoly_basis()
+        ).reshape(alpha.size, 100, 100) * apu.rad
+
+    K_coeff_alpha = actuator_low.fit_zpoly(phase_pr=phase_pr, alpha=alpha)
+
+    assert K_coeff_alpha.shape == (alpha.size, actuator_low.N_K_coeff)
+    assert_allclose(K_coeff_alpha, K_coeff_alpha_true, atol=1e-10)
+
+
+def test_fit_grav_deformation():
+
+    alpha = [7, 10, 20, 30, 32, 40, 50, 60, 70, 80, 90] * apu.deg
+
+    with NumpyRNGContext(0):
+        g_coeff_true = np.random.uniform(-1, 1, (actuator.N_K_coeff, 3))
+
+    K_coeff_alpha = np.array(
+        [actuator.grav_deformation(g, alpha) for g in g_coeff_true]
+        ).T
+
+    g_coeff = actuator.fit_grav_deformation(
+        K_coeff_alpha=K_coeff_alpha, alpha=alpha
+        )
+
+    assert g_coeff.shape == (actuator.N_K_coeff, 3)
+    assert_allclose(g_coeff, g_coeff_true, atol=1e-10)
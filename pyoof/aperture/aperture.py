@@ -4,10 +4,13 @@
 # Author: Tomas Cassanelli
 import numpy as np
 import warnings
+from functools import lru_cache
 import astropy  # only used for workaround
 from astropy import units as apu
+from scipy import fft as sp_fft
 from ..math_functions import cart2pol, rms
-from ..zernike import U
+from ..zernike import U_stack
+from ..zernike.zernike import _U_factors
 
 __all__ = [
     'illum_parabolic', 'illum_gauss', 'wavefront', 'phase', 'aperture',
@@ -124,19 +127,29 @@ def illum_parabolic(x, y, I_coeff, pr):
     if type(y0) != apu.quantity.Quantity:
         y0 *= apu.m
 
+    if type(c) == apu.quantity.Quantity:
+        c = c.to_value(apu.one)
+
     # c_dB has to be negative, bounds given [-8, -25]
-    r = np.sqrt((x - x0) ** 2 + (y - y0) ** 2)
+    # squared radial distance (rho' / R) ** 2, no square root needed
+    _x = ((x - x0) / pr).to_value(apu.one)
+    _y = ((y - y0) / pr).to_value(apu.one)
+    # x and y may broadcast or be scalars, Ea is always an array
+    Ea = np.asarray(np.add(_x * _x, _y * _y))
 
-    # Parabolic taper on a pedestal
+    # Parabolic taper on a pedestal, evaluated in-place on a single array
     with warnings.catch_warnings():
         warnings.simplefilter("ignore")
 
-        Ea = np.nan_to_num(
-            (i_amp * (c + (1. - c) * (1. - (r / pr) ** 2) ** q)).value
-            )
+        np.subtract(1., Ea, out=Ea)
+        Ea **= q
+        Ea *= (1. - c)
+        Ea += c
+        Ea *= i_amp
         # some values of c_dB may introduce np.nan in the cross terms
+        np.nan_to_num(Ea, copy=False)
 
-    return Ea
+    return Ea[()]  # scalar for scalar inputs
 
 
 def illum_gauss(x, y, I_coeff, pr):
@@ -241,15 +254,25 @@ def wavefront(rho, theta, K_coeff, wavel):
     # Total number of Zernike circle polynomials
     n = int((np.sqrt(1 + 8 * K_coeff.size) - 3) / 2)
 
-    # list of tuples with (n, l) allowed values
-    nl = [(i, j) for i in range(0, n + 1) for j in range(-i, i + 1, 2)]
+    # workaround for units, the polynomials are dimensionless
+    if type(rho) == apu.quantity.Quantity:
+        rho = rho.to_value(apu.one)
+    if type(theta) == apu.quantity.Quantity:
+        theta = theta.to_value(apu.rad)
 
-    # Wavefront (aberration) distribution
-    W = sum(
-        K_coeff[i] * U(*nl[i], rho, theta)
-        for i in range(K_coeff.size)
-        )
-    return W/wavel
+    if type(K_coeff) == apu.quantity.Quantity:
+        K_unit, K_coeff = K_coeff.unit, K_coeff.value
+    else:
+        K_unit = 1
+
+    # Wavefront (aberration) distribution, accumulated one polynomial at a
+    # time, i.e. no (N_K_coeff, N, N) stack, and null coefficients skipped
+    W = np.zeros(np.broadcast(rho, theta).shape)
+    for K, (radial, angular) in zip(K_coeff, _U_factors(n, rho, theta)):
+        if K != 0:
+            W += (K * radial) * angular
+
+    return W * K_unit / wavel
 
 
 def phase(K_coeff, pr, piston, tilt, wavel, resolution=1000):
@@ -333,16 +356,22 @@ def phase(K_coeff, pr, piston, tilt, wavel, resolution=1000):
     # TODO: change resolution name here, not the same as the one in radiation_pattern
     x = np.linspace(-pr, pr, resolution)
     y = np.linspace(-pr, pr, resolution)
-    x_grid, y_grid = np.meshgrid(x, y)
+    # broadcasting views instead of a full meshgrid, r and t are still 2-dim
+    x_grid, y_grid = x[np.newaxis, :], y[:, np.newaxis]
 
     r, t = cart2pol(x_grid, y_grid)
     r_norm = r / pr       # For orthogonality U(n, l) polynomials
 
     # Wavefront (aberration) distribution
     W = wavefront(rho=r_norm, theta=t, K_coeff=_K_coeff, wavel = wavel)
-    W[(x_grid ** 2 + y_grid ** 2 > pr ** 2)] = 0
+    if type(pr) == apu.quantity.Quantity:
+        W[_pupil_mask(pr.value, resolution)] = 0
+    else:
+        W[_pupil_mask(pr, resolution)] = 0
 
-    phi = W * 2 * np.pi *apu.rad   # Aperture phase distribution in radians
+    # Aperture phase distribution in radians, scalar factor folded so that
+    # only one grid-sized array is allocated
+    phi = W * (2 * np.pi * apu.rad)
 
     return x, y, phi
 
@@ -412,30 +441,78 @@ def aperture(x, y, I_coeff, K_coeff, d_z, wavel, illum_func, telgeo):
     and illumination function.
     """
 
-    r, t = cart2pol(x, y)
-
-    [block_dist, opd_func, pr] = telgeo
+    block_dist = telgeo[0]
     B = block_dist(x=x, y=y)
 
-    # Normalization to be used in the Zernike circle polynomials
-    r_norm = r / pr
+    E = _aperture(
+        x=x,
+        y=y,
+        B=B,
+        I_coeff=I_coeff,
+        K_coeff=K_coeff,
+        d_z=d_z,
+        wavel=wavel,
+        illum_func=illum_func,
+        telgeo=telgeo
+        )
+
+    return E
+
+
+def _aperture(
+    x, y, B, I_coeff, K_coeff, d_z, wavel, illum_func, telgeo,
+    zernike_stack=None
+        ):
+    """
+    Aperture distribution, `~pyoof.aperture.aperture`, for an already
+    evaluated blockage distribution ``B``. The grid ``x``, ``y`` can have any
+    shape, e.g. only the unblocked points of the full grid. If given,
+    ``zernike_stack`` is the `~pyoof.zernike.U_stack` output for the same
+    grid, and the wavefront is a single contraction with ``K_coeff``.
+    """
+
+    [block_dist, opd_func, pr] = telgeo
 
-    # Wavefront (aberration) distribution
-    W = wavefront(rho=r_norm, theta=t, K_coeff=K_coeff, wavel=wavel)
     delta = opd_func(x=x, y=y, d_z=d_z)  # Optical path difference function
     Ea = illum_func(x=x, y=y, I_coeff=I_coeff, pr=pr)  # Illumination function
 
     # Transformation: wavefront (aberration) distribution -> phase-error
-    phi = (W + delta / wavel) * 2 * np.pi * apu.rad
-    # phase-error plus the OPD function
+    # plus the OPD function, the wave number is computed only once
+    k = 2 * np.pi / wavel
 
-    with apu.set_enabled_equivalencies(apu.dimensionless_angles()):
-        E = B * Ea * np.exp(phi * 1j)  # Aperture distribution
-    return E.decompose().value
+    # Wavefront (aberration) distribution
+    if zernike_stack is None:
+        r, t = cart2pol(x, y)
+
+        # Normalization to be used in the Zernike circle polynomials
+        r_norm = r / pr
+
+        # wavefront is already given in wavelength units
+        W = wavefront(rho=r_norm, theta=t, K_coeff=K_coeff, wavel=wavel)
+        phi = W * (2 * np.pi) + delta * k
+    else:
+        W = np.tensordot(K_coeff, zernike_stack, axes=1)
+        phi = (W + delta) * k
+
+    # phase-error plus the OPD function, in radians
+    if type(phi) == apu.quantity.Quantity:
+        phi = phi.to_value(apu.one)
+
+    # Aperture distribution, B * Ea * (cos(phi) + i sin(phi)) written
+    # directly into the real and imaginary parts, no complex temporaries
+    amplitude = B * Ea
+    E = np.empty(np.broadcast(amplitude, phi).shape, dtype=np.complex128)
+    np.cos(phi, out=E.real)
+    np.sin(phi, out=E.imag)
+    E.real *= amplitude
+    E.imag *= amplitude
+
+    return E
 
 
 def radiation_pattern(
-    I_coeff, K_coeff, d_z, wavel, illum_func, telgeo, resolution, box_factor
+    I_coeff, K_coeff, d_z, wavel, illum_func, telgeo, resolution, box_factor,
+    dtype=np.complex128
         ):
     """
     Spectrum or (field) radiation pattern, :math:`F(u, v)`, it is the FFT2
@@ -460,7 +537,8 @@ def radiation_pattern(
         units. This characteristic measurement adds the classical interference
         pattern to the beam maps, normalized squared (field) radiation
         pattern, which is an out-of-focus property. It is usually of the order
-        of centimeters.
+        of centimeters. If ``d_z`` is a 1-dim array, all maps are computed
+        at once and stacked along the first axis of ``F_shift``.
     wavel : `~astropy.units.quantity.Quantity`
         Wavelength, :math:`\\lambda`, of the observation in length units.
     illum_func : `function`
@@ -481,7 +559,11 @@ def radiation_pattern(
         pixel size level. It depends on the primary radius, ``pr``, of the
         telescope, e.g. a ``box_factor = 5`` returns ``x = np.linspace(-5 *
         pr, 5 * pr, resolution)``, an array to be used in the FFT2
-        (`~numpy.fft.fft2`).
+        (`~scipy.fft.fft2`).
+    dtype : `~numpy.dtype`
+        Complex data type of the aperture distribution grid and the FFT2.
+        Default is `~numpy.complex128`, `~numpy.complex64` halves the memory
+        and roughly doubles the FFT2 speed at single precision.
 
     Returns
     -------
@@ -494,10 +576,15 @@ def radiation_pattern(
         in meters from the aperture distribution,
         :math:`\\underline{E_\\mathrm{a}}(x, y)`.
     F_shift : `~numpy.ndarray`
-        Output from the FFT2 (`~numpy.fft.fft2`), :math:`F(u, v)`,
+        Output from the FFT2 (`~scipy.fft.fft2`), :math:`F(u, v)`,
         unnormalized solution in a grid, defined by **resolution** and
         **box_factor** keys.
 
+    Raises
+    ------
+    `ValueError`
+        If **dtype** is not a complex data type.
+
     Notes
     -----
     The (field) radiation pattern is the direct Fourier Transform in two
@@ -509,46 +596,157 @@ def radiation_pattern(
         \\right].
     """
 
+    if not np.issubdtype(dtype, np.complexfloating):
+        raise ValueError(
+            f'dtype must be a complex data type, got {np.dtype(dtype)}'
+            )
+
     # Arrays to generate (field) radiation pattern
-    pr = telgeo[2]
-    box_size = pr * box_factor
+    block_dist, _, pr = telgeo
+    if type(pr) == apu.quantity.Quantity:
+        grid_key = (
+            block_dist, pr.to_value(apu.m), box_factor, resolution, True
+            )
+    else:
+        grid_key = (block_dist, pr, box_factor, resolution, False)
 
-    x = np.linspace(-box_size, box_size, resolution)
-    y = x.copy()
-    x_grid, y_grid = np.meshgrid(x, y)
+    # Total number of Zernike circle polynomials
+    n = int((np.sqrt(1 + 8 * K_coeff.size) - 3) / 2)
 
-    dx = x[1] - x[0]
-    dy = y[1] - y[0]
+    x, idx, x_in, y_in, B_in = _aperture_grid(*grid_key)
+    zernike_stack = _aperture_basis(*grid_key, n)
+
+    # several radial offsets share the grid, one map per d_z along axis 0
+    batch = np.ndim(d_z) > 0
+    if batch:
+        d_z = d_z[:, np.newaxis]
 
-    # Aperture distribution model
-    E = aperture(
-        x=x_grid,
-        y=y_grid,
+    # Aperture distribution model, only evaluated where B(x, y) != 0
+    E = np.zeros(np.shape(d_z)[:1] + (resolution, resolution), dtype=dtype)
+    E[(Ellipsis, ) + idx] = _aperture(
+        x=x_in,
+        y=y_in,
+        B=B_in,
         K_coeff=K_coeff,
         I_coeff=I_coeff,
         d_z=d_z,
         wavel=wavel,
         illum_func=illum_func,
-        telgeo=telgeo
+        telgeo=telgeo,
+        zernike_stack=zernike_stack
         )
 
     # note that after FFT quantities become numpy arrays
-    F = np.fft.fft2(E)
-    F_shift = np.fft.fftshift(F)  # (field) radiation pattern
+    # scipy's pocketfft runs the 2D transform on all available threads, E
+    # is a local array so the transform may reuse its memory
+    F = sp_fft.fft2(E, axes=(-2, -1), overwrite_x=True, workers=-1)
+    if resolution % 2 == 0:
+        # already centred, the chequerboard sign is included in B_in
+        F_shift = F  # (field) radiation pattern
+    else:
+        F_shift = np.fft.fftshift(F, axes=(-2, -1))
 
-    # wave-vectors in 1 / m
-    u, v = np.fft.fftfreq(x.size, dx), np.fft.fftfreq(y.size, dy)
+    # wave-vectors in 1 / m, same for u and v since the grid is square
+    u = v = _freq_axis(*grid_key)
 
     # workaround units and the new astropy version
     if type(x) == apu.quantity.Quantity:
         if astropy.__version__ < '4':
-            u_shift = np.fft.fftshift(u) * u.unit * wavel * apu.rad
-            v_shift = np.fft.fftshift(v) * v.unit * wavel * apu.rad
+            u_shift = u * u.unit * wavel * apu.rad
+            v_shift = v * v.unit * wavel * apu.rad
         else:
-            u_shift = np.fft.fftshift(u) * wavel * apu.rad
-            v_shift = np.fft.fftshift(v) * wavel * apu.rad
+            u_shift = u * wavel * apu.rad
+            v_shift = v * wavel * apu.rad
     else:
-        u_shift = np.fft.fftshift(u) * wavel.to_value(apu.m)
-        v_shift = np.fft.fftshift(v) * wavel.to_value(apu.m)
+        u_shift = u * wavel.to_value(apu.m)
+        v_shift = v * wavel.to_value(apu.m)
 
     return u_shift, v_shift, F_shift
+
+
+@lru_cache(maxsize=8)
+def _pupil_mask(pr, resolution):
+    """
+    Points outside the primary reflector in the `~pyoof.aperture.phase`
+    grid. It only depends on ``pr`` and ``resolution``, so it is computed once
+    and cached (read-only). The mask is scale invariant, ``pr`` is a `float`
+    in any length units.
+    """
+
+    x = np.linspace(-pr, pr, resolution)
+    mask = x[np.newaxis, :] ** 2 + x[:, np.newaxis] ** 2 > pr ** 2
+    mask.setflags(write=False)
+
+    return mask
+
+
+@lru_cache(maxsize=8)
+def _aperture_grid(block_dist, pr, box_factor, resolution, quantity):
+    """
+    Grid used by `~pyoof.aperture.radiation_pattern`. The grid and the
+    blockage distribution only depend on the telescope geometry and FFT
+    setup, so they are computed once and reused during the least squares
+    minimization. Returns the 1-dim axis, the indices of the unblocked
+    points and their ``x``, ``y`` and blockage values. For an even
+    ``resolution`` the blockage values carry the chequerboard sign
+    :math:`(-1)^{i + j}`, which makes the FFT2 output already centred, i.e.
+    there is no need for `~numpy.fft.fftshift`.
+    """
+
+    box_size = pr * box_factor
+    x = np.linspace(-box_size, box_size, resolution)
+    if quantity:
+        x = x * apu.m
+
+    # broadcasting views instead of a full meshgrid
+    B = block_dist(x=x[np.newaxis, :], y=x[:, np.newaxis])
+    idx = np.nonzero(B)
+    B_in = B[idx]
+
+    if resolution % 2 == 0:
+        B_in[(idx[0] + idx[1]) % 2 == 1] *= -1
+    B_in.setflags(write=False)
+
+    return x, idx, x[idx[1]], x[idx[0]], B_in
+
+
+@lru_cache(maxsize=8)
+def _aperture_basis(block_dist, pr, box_factor, resolution, quantity, n):
+    """
+    Zernike circle polynomials, `~pyoof.zernike.U_stack`, up to order ``n``
+    evaluated at the unblocked points of `~pyoof.aperture._aperture_grid`.
+    They do not change during the least squares minimization, hence the
+    wavefront is reduced to a single contraction with ``K_coeff``.
+    """
+
+    _, _, x_in, y_in, _ = _aperture_grid(
+        block_dist, pr, box_factor, resolution, quantity
+        )
+
+    r, t = cart2pol(x_in, y_in)
+    if quantity:
+        r = r.to_value(apu.m)
+        t = t.to_value(apu.rad)
+
+    zernike_stack = U_stack(n, r / pr, t)
+    zernike_stack.setflags(write=False)
+
+    return zernike_stack
+
+
+@lru_cache(maxsize=8)
+def _freq_axis(block_dist, pr, box_factor, resolution, quantity):
+    """
+    Wave-vector axis, in 1 / m, of the `~pyoof.aperture._aperture_grid`
+    FFT2. Same as ``fftshift(fftfreq(resolution, dx))``, computed once per
+    grid (read-only).
+    """
+
+    x = _aperture_grid(block_dist, pr, box_factor, resolution, quantity)[0]
+    dx = x[1] - x[0]
+
+    freq = np.arange(-(resolution // 2), resolution - resolution // 2)
+    freq_axis = freq / (resolution * dx)
+    freq_axis.setflags(write=False)
+
+    return freq_axis
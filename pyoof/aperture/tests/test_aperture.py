@@ -70,6 +70,27 @@ def test_illum_parabolic():
     assert_allclose(_illum_parabolic_dimensionless, illum_parabolic_true)
 
 
+def test_illum_parabolic_broadcast():
+
+    _illum_parabolic = pyoof.aperture.illum_parabolic(
+        x=xx, y=yy, I_coeff=I_coeff, pr=pr
+        )
+
+    # broadcasting axes instead of a full meshgrid
+    _illum_parabolic_broadcast = pyoof.aperture.illum_parabolic(
+        x=x[np.newaxis, :], y=x[:, np.newaxis], I_coeff=I_coeff, pr=pr
+        )
+
+    # single point
+    _illum_parabolic_scalar = pyoof.aperture.illum_parabolic(
+        x=xx[10, 20], y=yy[10, 20], I_coeff=I_coeff, pr=pr
+        )
+
+    assert_allclose(_illum_parabolic_broadcast, _illum_parabolic)
+    assert np.ndim(_illum_parabolic_scalar) == 0
+    assert_allclose(_illum_parabolic_scalar, _illum_parabolic[10, 20])
+
+
 def test_illum_gauss():
 
     _illum_gauss = pyoof.aperture.illum_gauss(
@@ -148,3 +169,54 @@ def test_radiation_pattern():
     assert_allclose(_radiation_pattern, radiation_pattern_true)
     assert_quantity_allclose(_u, Quantity(u_true, apu.rad))
     assert_quantity_allclose(_v, Quantity(v_true, apu.rad))
+
+
+def test_radiation_pattern_dtype():
+
+    kwargs = dict(
+        K_coeff=K_coeff * wavel,
+        I_coeff=I_coeff,
+        d_z=d_z,
+        wavel=wavel,
+        illum_func=pyoof.aperture.illum_parabolic,
+        telgeo=telgeo,
+        resolution=2 ** 8,
+        box_factor=5
+        )
+
+    _, _, F = pyoof.aperture.radiation_pattern(**kwargs)
+    _, _, F_single = pyoof.aperture.radiation_pattern(
+        dtype=np.complex64, **kwargs
+        )
+
+    assert F.dtype == np.complex128
+    assert F_single.dtype == np.complex64
+    assert_allclose(F_single, F, atol=1e-5 * np.abs(F).max())
+
+    # a real dtype would drop the imaginary part of the aperture
+    with pytest.raises(ValueError):
+        pyoof.aperture.radiation_pattern(dtype=np.float32, **kwargs)
+
+
+def test_radiation_pattern_batch():
+
+    kwargs = dict(
+        K_coeff=K_coeff * wavel,
+        I_coeff=I_coeff,
+        wavel=wavel,
+        illum_func=pyoof.aperture.illum_parabolic,
+        telgeo=telgeo,
+        resolution=2 ** 8,
+        box_factor=5
+        )
+
+    d_z_maps = [-2.2, 0, 2.2] * apu.cm
+    _u, _v, F = pyoof.aperture.radiation_pattern(d_z=d_z_maps, **kwargs)
+
+    assert F.shape == (3, 2 ** 8, 2 ** 8)
+    for k, _d_z in enumerate(d_z_maps):
+        u, v, F_k = pyoof.aperture.radiation_pattern(d_z=_d_z, **kwargs)
+
+        assert_allclose(F[k], F_k)
+        assert_quantity_allclose(_u, u)
+        assert_quantity_allclose(_v, v)
@@ -4,6 +4,7 @@
 # Author: Tomas Cassanelli
 import os
 import yaml
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 from astropy.io import fits
 from astropy.time import Time
@@ -12,16 +13,26 @@ from astropy import units as apu
 from astropy.constants import c as light_speed
 from .math_functions import rms
 from .aperture import e_rs, phase
+from .zernike.zernike import _nl_indices
 
 __all__ = [
     "extract_data_multifrequency", 'extract_data_pyoof', 'extract_data_effelsberg', 'str2LaTeX',
     'store_data_csv', 'uv_ratio', 'store_data_ascii', 'table_pyoof_out'
     ]
 
+# libyaml C loader when available, the pyoof YAML files only hold plain types
+_YAMLLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+
 def extract_data_multifrequency(fits_paths):
+    fits_paths = list(fits_paths)
+
+    # FITS files are independent and IO bound, they are read concurrently
+    with ThreadPoolExecutor(max_workers=max(len(fits_paths), 1)) as executor:
+        data_list = list(executor.map(extract_data_pyoof, fits_paths))
+
     data_dict = {}
-    for fits_path  in fits_paths:
-        data = extract_data_pyoof(fits_path)
+    for data in data_list:
         wavel = data["wavel"]
         data_dict["wavel: {}".format(wavel)] = data
         data_dict["pthto"] = data["pthto"]
@@ -79,12 +90,26 @@ def extract_data_pyoof(pathfits):
     if os.path.splitext(pathfits)[1] != '.fits':
         raise ValueError('File must be a FITS file.')
 
-    hdulist = fits.open(pathfits)  # open FITS file, pyoof format
     # path or directory where the FITS file is located
     pthto = os.path.split(pathfits)[0]
     # name of the fit file to fit
     name = os.path.split(pathfits)[1][:-5]
 
+    # open FITS file, pyoof format, the columns are copied by np.stack so
+    # the (memory mapped) file is closed right after reading
+    with fits.open(pathfits, memmap=True) as hdulist:
+        data = _data_pyoof(hdulist=hdulist, name=name, pthto=pthto)
+
+    return data
+
+
+def _data_pyoof(hdulist, name, pthto):
+    """
+    Data dictionary from a `~pyoof` default `~astropy.io.fits.HDUList`, see
+    `~pyoof.extract_data_pyoof`. The HDUList may be a file or in memory,
+    e.g. `~pyoof.simulate_data_pyoof` with ``return_data=True``.
+    """
+
     if not all(
             k in hdulist[0].header
             for k in ['FREQ', 'WAVEL', 'MEANEL', 'OBJECT', 'DATE_OBS', "NMAPS"]
@@ -98,11 +123,16 @@ def extract_data_pyoof(pathfits):
     obs_date = hdulist[0].header['DATE_OBS']
     n_maps = hdulist[0].header['NMAPS']
     noise = hdulist[0].header['NOISE']
-    beam_data = np.array([hdulist[i].data['BEAM'] for i in range(1,n_maps+1)])
-    power = np.array([hdulist[i].data['POWER'] for i in range(1,n_maps+1)])
-    u_data = np.array([hdulist[i].data['U'] for i in range(1,n_maps+1)]) * apu.rad
-    v_data = np.array([hdulist[i].data['V'] for i in range(1,n_maps+1)]) * apu.rad
-    d_z = np.array([hdulist[i].header['DZ'] for i in range(1,n_maps+1)]) * apu.m
+    # each HDU is looked up once, then all columns are stacked from it
+    hdus = [hdulist[i] for i in range(1, n_maps + 1)]
+    tables = [hdu.data for hdu in hdus]
+    beam_data = np.stack([table['BEAM'] for table in tables])
+    power = np.stack([table['POWER'] for table in tables])
+    u_data = np.stack([table['U'] for table in tables]) * apu.rad
+    v_data = np.stack([table['V'] for table in tables]) * apu.rad
+    d_z = np.fromiter(
+        (hdu.header['DZ'] for hdu in hdus), dtype=np.float64, count=n_maps
+        ) * apu.m
 
     data_file = [name, pthto]
     data_info = data_file + [obs_object, obs_date, freq, wavel, d_z, meanel]
@@ -165,21 +195,28 @@ def extract_data_effelsberg(pathfits):
         raise ValueError('File must be a FITS file.')
 
     pos = [3, 1, 2]  # Positions for OOF holography observations at Effelsberg
-    hdulist = fits.open(pathfits)  # main FITS file OOF holography format
-
-    # Observation frequency
-    freq = hdulist[0].header['FREQ'] * apu.Hz
-    wavel = light_speed / freq
-
-    # Mean elevation
-    meanel = hdulist[0].header['MEANEL'] * apu.deg
-    obs_object = hdulist[0].header['OBJECT']        # observed object
-    obs_date = hdulist[0].header['DATE_OBS']        # observation date
-    d_z = np.array([hdulist[i].header['DZ'] for i in pos]) * apu.m
-
-    beam_data = np.array([hdulist[i].data['fnu'] for i in pos])
-    u_data = np.array([hdulist[i].data['DX'] for i in pos]) * apu.rad
-    v_data = np.array([hdulist[i].data['DY'] for i in pos]) * apu.rad
+    # main FITS file OOF holography format, the columns are copied by
+    # np.stack so the (memory mapped) file is closed right after reading
+    with fits.open(pathfits, memmap=True) as hdulist:
+        # Observation frequency
+        freq = hdulist[0].header['FREQ'] * apu.Hz
+        wavel = light_speed / freq
+
+        # Mean elevation
+        meanel = hdulist[0].header['MEANEL'] * apu.deg
+        obs_object = hdulist[0].header['OBJECT']        # observed object
+        obs_date = hdulist[0].header['DATE_OBS']        # observation date
+        # each HDU is looked up once, then all columns are stacked from it
+        hdus = [hdulist[i] for i in pos]
+        d_z = np.fromiter(
+            (hdu.header['DZ'] for hdu in hdus), dtype=np.float64,
+            count=len(pos)
+            ) * apu.m
+
+        tables = [hdu.data for hdu in hdus]
+        beam_data = np.stack([table['fnu'] for table in tables])
+        u_data = np.stack([table['DX'] for table in tables]) * apu.rad
+        v_data = np.stack([table['DY'] for table in tables]) * apu.rad
 
     # path or directory where the FITS file is located
     pthto = os.path.split(pathfits)[0]
@@ -220,17 +257,12 @@ def str2LaTeX(python_string):
         String with the new underscore symbol.
     """
 
-    string_list = list(python_string)
-    for idx, string in enumerate(string_list):
-        if string_list[idx] == '_':
-            string_list[idx] = '\\_'
-
-    LaTeX_string = ''.join(string_list)
+    LaTeX_string = python_string.replace('_', '\\_')
 
     return LaTeX_string
 
 
-def store_data_csv(name, name_dir, order, wavel, save_to_csv):
+def store_data_csv(name, name_dir, order, wavel, save_to_csv, binary=False):
     """
     Stores all important information in a CSV file after the least squares
     minimization has finished, `~pyoof.fit_zpoly`. All data will be stored in
@@ -251,6 +283,11 @@ def store_data_csv(name, name_dir, order, wavel, save_to_csv):
         It contains all data that will be stored. The list must have the
         following order, ``[beam_data, u_data, v_data, res_optim, jac_optim,
         grad_optim, phase, cov_ptrue, corr_ptrue]``.
+    binary : `bool`
+        If `True` all the arrays are stored in a single compressed binary
+        file, ``outputs_n{order}_{wavel}.npz``, instead of one text CSV file
+        per array. Much faster to write, but the rest of the `~pyoof`
+        routines read the CSV files, which is the default.
     """
 
     headers = [
@@ -267,17 +304,30 @@ def store_data_csv(name, name_dir, order, wavel, save_to_csv):
         f'cov_n{order}_{wavel}.csv', f'corr_n{order}_{wavel}.csv'
         ]
 
+    keys = [
+        'beam_data', 'u_data', 'v_data', 'res', 'jac', 'grad', 'phase', 'cov',
+        'corr'
+        ]
+
     if order != 1:
         headers = headers[3:]
         fnames = fnames[3:]
+        keys = keys[3:]
         save_to_csv = save_to_csv[3:]
-    for fname, header, file in zip(fnames, headers, save_to_csv):
-        name_dir = name_dir.replace("//", "/")
-        np.savetxt(
-            fname=os.path.join(name_dir, fname),
-            X=file,
-            header=' '.join((header, name))
+
+    name_dir = name_dir.replace("//", "/")
+    if binary:
+        np.savez_compressed(
+            os.path.join(name_dir, f'outputs_n{order}_{wavel}.npz'),
+            **dict(zip(keys, save_to_csv))
             )
+    else:
+        for fname, header, file in zip(fnames, headers, save_to_csv):
+            np.savetxt(
+                fname=os.path.join(name_dir, fname),
+                X=file,
+                header=' '.join((header, name))
+                )
 
 
 def store_data_ascii(name, name_dir, order, params_solution, params_init):
@@ -307,9 +357,8 @@ def store_data_ascii(name, name_dir, order, params_solution, params_init):
     N_K_coeff = (n + 1) * (n + 2) // 2
 
     # Making nice table :)
-    ln = [(j, i) for i in range(0, n + 1) for j in range(-i, i + 1, 2)]
-    L = np.array(ln)[:, 0]
-    N = np.array(ln)[:, 1]
+    # cached (n, l) table, same order as the K_coeff
+    N, L = _nl_indices(n).T
 
     params_names = ['i_amp', 'c_dB', 'q', 'x_0', 'y_0']
     for i in range(N_K_coeff):
@@ -387,15 +436,16 @@ def table_pyoof_out(path_pyoof_out, order):
             'i_amp', 'c_dB', 'q', 'phase-rms', 'e_rs',
             'beam-snr-out-l', 'beam-snr-in', 'beam-snr-out-r'
             ],
-        dtype=[np.string_] * 4 + [np.float] * 9
+        dtype=[np.string_] * 4 + [np.float64] * 9
         )
 
     for p, pyoof_out in enumerate(path_pyoof_out):
         with open(os.path.join(pyoof_out, 'pyoof_info.yml'), 'r') as inputfile:
-            pyoof_info = yaml.load(inputfile, Loader=yaml.Loader)
+            pyoof_info = yaml.load(inputfile, Loader=_YAMLLoader)
 
-        _phase = np.genfromtxt(
-            os.path.join(pyoof_out, f'phase_n{order}.csv')
+        # plain whitespace-separated floats from store_data_csv
+        _phase = np.loadtxt(
+            os.path.join(pyoof_out, f'phase_n{order}.csv'), dtype=np.float64
             ) * apu.rad
         phase_rms = rms(_phase, circ=True)
         phase_e_rs = e_rs(_phase, circ=True)
@@ -14,7 +14,7 @@ import yaml
 from .aperture import radiation_pattern, phase
 from .math_functions import co_matrices, norm, snr
 from .plot_routines import plot_fit_path
-from .aux_functions import store_data_csv, store_data_ascii
+from .aux_functions import store_data_csv, store_data_ascii, _YAMLLoader
 
 __all__ = [
     'residual_true', 'residual', 'params_complete', 'fit_zpoly', "multifrequency_zernike_fit"
@@ -31,38 +31,42 @@ def residual_true_multifrequency(params, data, illum_func, telgeo, resolution, b
             d_z = current["d_z"]
             u_data = current["u_data"]
             v_data = current["v_data"]
-            for i in range(len(d_z)):
-                u, v, F = radiation_pattern(
-                    I_coeff=I_coeff,
-                    K_coeff=K_coeff,
-                    d_z=d_z[i],
-                    wavel=wavel,
-                    illum_func=illum_func,
-                    telgeo=telgeo,
-                    resolution=resolution,
-                    box_factor=box_factor
-                    )
 
-                power_pattern = np.abs(F) ** 2
+            # the d_z maps share grid, illumination and wavefront, they are
+            # computed at once with a single batched FFT2
+            u, v, F = radiation_pattern(
+                I_coeff=I_coeff,
+                K_coeff=K_coeff,
+                d_z=d_z,
+                wavel=wavel,
+                illum_func=illum_func,
+                telgeo=telgeo,
+                resolution=resolution,
+                box_factor=box_factor
+                )
+
+            power_pattern = np.abs(F) ** 2
 
-                if interp:
+            if interp:
+                # units stripped once, not per map
+                points = (u.to_value(apu.rad), v.to_value(apu.rad))
+                uv_data = np.stack(
+                    (u_data.to_value(apu.rad), v_data.to_value(apu.rad)), axis=-1
+                    )
+
+                for i in range(len(d_z)):
 
                     # The calculated beam needs to be transformed!
                     intrp = interpolate.RegularGridInterpolator(
-                        points=(u.to_value(apu.rad), v.to_value(apu.rad)),
-                        values=power_pattern.T,     # data in grid
-                        method='linear'             # linear or nearest
+                        points=points,
+                        values=power_pattern[i, ...].T,  # data in grid
+                        method='linear'                  # linear or nearest
                         )
 
                     # input interpolation function is the real beam grid
-                    beam_model[i, ...] = (
-                        intrp(np.array([
-                            u_data[i, ...].to_value(apu.rad),
-                            v_data[i, ...].to_value(apu.rad)
-                            ]).T)
-                        )
-                else:
-                    beam_model[i, ...] = power_pattern
+                    beam_model[i, ...] = intrp(uv_data[i, ...])
+            else:
+                beam_model[...] = power_pattern
 
             _residual_true = norm(current["beam_data"], axis=1) - norm(beam_model, axis=1)
             residuals.append(_residual_true.flatten())
@@ -142,38 +146,42 @@ def residual_true(
 
     I_coeff, K_coeff = params[:5], params[5:]
     beam_model = np.zeros_like(beam_data)
-    for i in range(len(d_z)):
-        u, v, F = radiation_pattern(
-            I_coeff=I_coeff,
-            K_coeff=K_coeff,
-            d_z=d_z[i],
-            wavel=wavel,
-            illum_func=illum_func,
-            telgeo=telgeo,
-            resolution=resolution,
-            box_factor=box_factor
-            )
 
-        power_pattern = np.abs(F) ** 2
+    # the d_z maps share grid, illumination and wavefront, they are computed
+    # at once with a single batched FFT2
+    u, v, F = radiation_pattern(
+        I_coeff=I_coeff,
+        K_coeff=K_coeff,
+        d_z=d_z,
+        wavel=wavel,
+        illum_func=illum_func,
+        telgeo=telgeo,
+        resolution=resolution,
+        box_factor=box_factor
+        )
 
-        if interp:
+    power_pattern = np.abs(F) ** 2
+
+    if interp:
+        # units stripped once, not per map
+        points = (u.to_value(apu.rad), v.to_value(apu.rad))
+        uv_data = np.stack(
+            (u_data.to_value(apu.rad), v_data.to_value(apu.rad)), axis=-1
+            )
+
+        for i in range(len(d_z)):
 
             # The calculated beam needs to be transformed!
             intrp = interpolate.RegularGridInterpolator(
-                points=(u.to_value(apu.rad), v.to_value(apu.rad)),
-                values=power_pattern.T,     # data in grid
-                method='linear'             # linear or nearest
+                points=points,
+                values=power_pattern[i, ...].T,  # data in grid
+                method='linear'                  # linear or nearest
                 )
 
             # input interpolation function is the real beam grid
-            beam_model[i, ...] = (
-                intrp(np.array([
-                    u_data[i, ...].to_value(apu.rad),
-                    v_data[i, ...].to_value(apu.rad)
-                    ]).T)
-                )
-        else:
-            beam_model[i, ...] = power_pattern
+            beam_model[i, ...] = intrp(uv_data[i, ...])
+    else:
+        beam_model[...] = power_pattern
 
     _residual_true = norm(beam_data, axis=1) - norm(beam_model, axis=1)
 
@@ -386,10 +394,10 @@ def multifrequency_zernike_fit(data, order_max, illum_func, telescope, resolutio
     if config_params_file is None:
         config_params_pyoof = get_pkg_data_filename('data/config_params.yml')
         with open(config_params_pyoof, 'r') as yaml_config:
-            config_params = yaml.load(yaml_config, Loader=yaml.Loader)
+            config_params = yaml.load(yaml_config, Loader=_YAMLLoader)
     else:
         with open(config_params_file, 'r') as yaml_config:
-            config_params = yaml.load(yaml_config, Loader=yaml.Loader)
+            config_params = yaml.load(yaml_config, Loader=_YAMLLoader)
     
      # Storing files in pyoof_out directory
     if not os.path.exists(os.path.join(work_dir, 'pyoof_out')):
@@ -432,6 +440,7 @@ def multifrequency_zernike_fit(data, order_max, illum_func, telescope, resolutio
             end='\n'
             )
 
+    figs = None  # plot_fit_path figures, re-drawn for every order
     for order in range(1, order_max + 1):
 
         if not verbose == 0:
@@ -611,7 +620,7 @@ def multifrequency_zernike_fit(data, order_max, illum_func, telescope, resolutio
                     if not verbose == 0:
                         print('\n ... Making plots ...')
                     # Making all relevant plots
-                    plot_fit_path(
+                    figs = plot_fit_path(
                         path_pyoof_out=name_dir,
                         order=n,
                         telgeo=telgeo,
@@ -621,9 +630,10 @@ def multifrequency_zernike_fit(data, order_max, illum_func, telescope, resolutio
                         save=True,
                         angle=apu.deg,
                         i=key.split(" ")[1],
+                        figs=figs
                         )
 
-                    plt.close('all')
+    plt.close('all')
     return params_solution[5:]
 
  #   final_time = np.round((time.time() - start_time) / 60, 2)
@@ -720,10 +730,10 @@ def fit_zpoly(
     if config_params_file is None:
         config_params_pyoof = get_pkg_data_filename('data/config_params.yml')
         with open(config_params_pyoof, 'r') as yaml_config:
-            config_params = yaml.load(yaml_config, Loader=yaml.Loader)
+            config_params = yaml.load(yaml_config, Loader=_YAMLLoader)
     else:
         with open(config_params_file, 'r') as yaml_config:
-            config_params = yaml.load(yaml_config, Loader=yaml.Loader)
+            config_params = yaml.load(yaml_config, Loader=_YAMLLoader)
 
     # Storing files in pyoof_out directory
     if not os.path.exists(os.path.join(work_dir, 'pyoof_out')):
@@ -756,6 +766,7 @@ def fit_zpoly(
         end='\n'
         )
 
+    figs = None  # plot_fit_path figures, re-drawn for every order
     for order in range(1, order_max + 1):
 
         if not verbose == 0:
@@ -927,17 +938,18 @@ def fit_zpoly(
                 print('\n ... Making plots ...')
 
             # Making all relevant plots
-            plot_fit_path(
+            figs = plot_fit_path(
                 path_pyoof_out=name_dir,
                 order=n,
                 telgeo=telgeo,
                 illum_func=illum_func,
                 plim=plim,
                 save=True,
-                angle=apu.deg
+                angle=apu.deg,
+                figs=figs
                 )
 
-            plt.close('all')
+    plt.close('all')
 
     final_time = np.round((time.time() - start_time) / 60, 2)
     print(f'\n ***** PYOOF FIT COMPLETED AT {final_time} mins *****\n')
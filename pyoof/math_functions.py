@@ -61,7 +61,7 @@ def cart2pol(x, y):
         Grid value for the angular variable, in radians.
     """
 
-    rho = np.sqrt(x ** 2 + y ** 2)
+    rho = np.hypot(x, y)
     theta = np.arctan2(y, x)
 
     return rho, theta
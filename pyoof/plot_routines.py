@@ -4,7 +4,6 @@
 # Author: Tomas Cassanelli
 import numpy as np
 import matplotlib.pyplot as plt
-from matplotlib.gridspec import GridSpec
 from mpl_toolkits.axes_grid1 import make_axes_locatable
 from scipy import interpolate
 from astropy.table import Table
@@ -13,8 +12,8 @@ import warnings
 import os
 import yaml
 from .aperture import radiation_pattern, phase
-from .aux_functions import uv_ratio
-from .math_functions import norm
+from .aux_functions import uv_ratio, _YAMLLoader
+from .zernike.zernike import _nl_indices
 
 __all__ = [
     'plot_beam', 'plot_beam_data', 'plot_phase', 'plot_phase_data',
@@ -22,10 +21,26 @@ __all__ = [
     ]
 
 
+def _get_figure(fig, figsize, **kwargs):
+    """
+    New `~matplotlib.figure.Figure`, or the cleared ``fig`` if one is given.
+    Re-drawing on an existing figure avoids creating (and registering in
+    `~matplotlib.pyplot`) a new one on every call of a fit loop.
+    """
+
+    if fig is None:
+        return plt.figure(figsize=figsize, **kwargs)
+
+    fig.clf()
+    fig.set_size_inches(figsize)
+
+    return fig
+
+
 # TODO: Generalize this functions for multiple d_z
 def plot_beam(
     I_coeff, K_coeff, d_z, wavel, illum_func, telgeo, resolution, box_factor,
-    plim, angle, title
+    plim, angle, title, fig=None
         ):
     """
     Beam maps, :math:`P_\\mathrm{norm}(u, v)`, figure given fixed
@@ -82,6 +97,9 @@ def plot_beam(
         Angle unit. Power pattern axes.
     title : `str`
         Figure title.
+    fig : `~matplotlib.figure.Figure`
+        Existing figure to be cleared and re-drawn, e.g. the output from a
+        previous call. Default is `None`, which creates a new figure.
 
     Returns
     -------
@@ -90,24 +108,30 @@ def plot_beam(
         different offset :math:`d_z` value. From left to right, :math:`d_z^-`,
         :math:`0` and :math:`d_z^+`.
     """
-    power_norm = np.zeros((d_z.size, resolution, resolution), dtype=np.float64)
-    u = np.zeros((d_z.size, resolution), dtype=np.float64) << apu.rad
-    v = np.zeros((d_z.size, resolution), dtype=np.float64) << apu.rad
     n_maps = len(d_z)
-    for k, _d_z in enumerate(d_z):
-
-        u[k, :], v[k, :], F = radiation_pattern(
-            K_coeff=K_coeff,
-            I_coeff=I_coeff,
-            d_z=_d_z,
-            wavel=wavel,
-            illum_func=illum_func,
-            telgeo=telgeo,
-            resolution=resolution,
-            box_factor=box_factor
-            )
 
-        power_norm[k, ...] = norm(np.abs(F) ** 2)
+    # all radial offsets share the grid, a single batched FFT2, in single
+    # precision since the maps are only displayed
+    u, v, F = radiation_pattern(
+        K_coeff=K_coeff,
+        I_coeff=I_coeff,
+        d_z=d_z,
+        wavel=wavel,
+        illum_func=illum_func,
+        telgeo=telgeo,
+        resolution=resolution,
+        box_factor=box_factor,
+        dtype=np.complex64
+        )
+
+    # |F|^2 without the square root of np.abs, single temporary
+    power_norm = np.multiply(F.real, F.real)
+    power_norm += np.square(F.imag)
+
+    # each map normalized independently, in place
+    power_norm -= power_norm.min(axis=(-2, -1), keepdims=True)
+    power_norm /= power_norm.max(axis=(-2, -1), keepdims=True)
+    np.nan_to_num(power_norm, copy=False)
 
     # Limits, they need to be transformed to degrees
     if plim is None:
@@ -116,10 +140,11 @@ def plot_beam(
         s_bw = bw * 8                           # size-beamwidth ratio radians
 
         # Finding central point for shifted maps
-        uu, vv = np.meshgrid(u[1, :], v[1, :])
-        print(uu[power_norm[1, ...] == power_norm[1, ...].max()][0])
-        u_offset = uu[power_norm[1, ...] == power_norm[1, ...].max()][0]
-        v_offset = vv[power_norm[1, ...] == power_norm[1, ...].max()][0]
+        iv, iu = np.unravel_index(
+            np.argmax(power_norm[1, ...]), power_norm[1, ...].shape
+            )
+        u_offset = u[iu]
+        v_offset = v[iv]
 
         plim = [
             (-s_bw + u_offset).to_value(apu.rad),
@@ -131,48 +156,42 @@ def plot_beam(
     plim_u, plim_v = plim[:2], plim[2:]
 
     subtitle = [
-        '$P_{\\textrm{\\scriptsize{norm}}}(u,v)$ $d_z=' +
-        str(round(d_z[i].to_value(apu.cm), 3)) + '$ cm' for i in range(n_maps)
+        '$P_{\\textrm{\\scriptsize{norm}}}(u,v)$ $d_z=' + str(_d_z) + '$ cm'
+        for _d_z in np.round(d_z.to_value(apu.cm), 3)
         ]
 
-    fig = plt.figure(figsize=uv_ratio(plim_u, plim_v), constrained_layout=True)
-    gs = GridSpec(
-        nrows=2,
-        ncols=n_maps,
-        figure=fig,
+    fig = _get_figure(
+        fig, figsize=uv_ratio(plim_u, plim_v), constrained_layout=True
         )
-
-
-    ax = [plt.subplot(gs[i]) for i in range(2*n_maps)]
+    # beam maps in the first row and their colorbars in the second
+    ax, cax = fig.subplots(nrows=2, ncols=n_maps, squeeze=False)
 
     #for i in range(n_maps):
     #    ax[i].set_yticklabels([])
 
-    cax = [ax[i + n_maps] for i in range(n_maps)]
+    # axes, color limits and contour levels for all maps at once
+    u_angle, v_angle = u.to_value(angle), v.to_value(angle)
+    extent = [u_angle.min(), u_angle.max(), v_angle.min(), v_angle.max()]
+    vmin = power_norm.min(axis=(-2, -1))
+    vmax = power_norm.max(axis=(-2, -1))
+    levels = np.linspace(vmin, vmax, 10, axis=-1)
 
     for i in range(n_maps):
-        vmin, vmax = power_norm[i, ...].min(), power_norm[i, ...].max()
-
-        extent = [
-            u[i, :].to_value(angle).min(), u[i, :].to_value(angle).max(),
-            v[i, :].to_value(angle).min(), v[i, :].to_value(angle).max()
-            ]
-        levels = np.linspace(vmin, vmax, 10)
-
         im = ax[i].imshow(
             X=power_norm[i, ...],
             extent=extent,
-            vmin=vmin,
-            vmax=vmax
+            vmin=vmin[i],
+            vmax=vmax[i]
             )
 
         ax[i].contour(
-            u[i, :].to_value(angle),
-            v[i, :].to_value(angle),
+            u_angle,
+            v_angle,
             power_norm[i, ...],
-            levels=levels,
+            levels=levels[i],
             colors='k',
-            linewidths=0.4
+            linewidths=0.4,
+            algorithm='serial'
             )
 
         ax[i].set_title(subtitle[i])
@@ -183,7 +202,7 @@ def plot_beam(
         ax[i].set_xlim(*plim_u)
         ax[i].grid(False)
 
-        plt.colorbar(
+        fig.colorbar(
             im, cax=cax[i], orientation='horizontal', use_gridspec=True
             )
         cax[i].set_xlabel('Amplitude [arb]')
@@ -209,8 +228,57 @@ def plot_beam_data_multifrequency(data, resolution, angle, title, res_mode):
 
     return figs
 
+
+def _interp_beam_data(u, v, beam, u_ng, v_ng):
+    """
+    Cubic interpolation of one observed beam map, ``beam`` at ``(u, v)``, to
+    the rectangular grid ``(u_ng, v_ng)``. All inputs are `~numpy.ndarray`
+    in the same angle units. If the observed points already form a complete
+    rectilinear grid the interpolation is done with a bicubic spline,
+    `~scipy.interpolate.RectBivariateSpline`, otherwise (or for less than
+    four points per axis) `~scipy.interpolate.griddata` triangulates the
+    scattered points. Both are independent of the data scale, e.g. residual
+    maps. Points outside the observed range are `~numpy.nan`.
+    """
+
+    u_axis, iu = np.unique(u, return_inverse=True)
+    v_axis, iv = np.unique(v, return_inverse=True)
+
+    if (
+        u_axis.size * v_axis.size == beam.size and
+        min(u_axis.size, v_axis.size) >= 4
+            ):
+        beam_img = np.full((v_axis.size, u_axis.size), np.nan)
+        beam_img[iv, iu] = beam
+
+        # repeated points leave holes in the grid
+        if not np.isnan(beam_img).any():
+            interp = interpolate.RectBivariateSpline(
+                x=v_axis, y=u_axis, z=beam_img, kx=3, ky=3
+                )
+            beam_ng = interp(v_ng, u_ng)
+
+            # same as griddata, no extrapolation
+            outside_v = (v_ng < v_axis[0]) | (v_ng > v_axis[-1])
+            outside_u = (u_ng < u_axis[0]) | (u_ng > u_axis[-1])
+            beam_ng[outside_v, :] = np.nan
+            beam_ng[:, outside_u] = np.nan
+
+            return beam_ng
+
+    return interpolate.griddata(
+        # coordinates of grid points to interpolate from.
+        points=(u, v),
+        values=beam,
+        # coordinates of grid points to interpolate to.
+        xi=tuple(np.meshgrid(u_ng, v_ng)),
+        method='cubic'
+        )
+
+
 def plot_beam_data(
-    u_data, v_data, beam_data, d_z, resolution, angle, title, res_mode
+    u_data, v_data, beam_data, d_z, resolution, angle, title, res_mode,
+    fig=None
         ):
     """
     Real data beam maps, :math:`P^\\mathrm{obs}(x, y)`, figures given
@@ -250,6 +318,9 @@ def plot_beam_data(
         If `True` the beam map will not be normalized. This feature is used
         to compare the residual outputs from the least squares minimization
         (`~pyoof.fit_zpoly`).
+    fig : `~matplotlib.figure.Figure`
+        Existing figure to be cleared and re-drawn, e.g. the output from a
+        previous call. Default is `None`, which creates a new figure.
 
     Returns
     -------
@@ -260,30 +331,26 @@ def plot_beam_data(
     """
     n_maps = len(d_z)
     if not res_mode:
-        # Power pattern normalization
-        beam_data = norm(beam_data, axis=1)
+        # Power pattern normalization, one copy, the input is not modified
+        beam_data = beam_data - beam_data.min(axis=1, keepdims=True)
+        beam_data /= beam_data.max(axis=1, keepdims=True)
+        np.nan_to_num(beam_data, copy=False)
 
     subtitle = [
-        '$P_{\\textrm{\\scriptsize{norm}}}(u,v)$ $d_z=' +
-        str(round(d_z[i].to_value(apu.cm), 3)) + '$ cm' for i in range(n_maps)
+        '$P_{\\textrm{\\scriptsize{norm}}}(u,v)$ $d_z=' + str(_d_z) + '$ cm'
+        for _d_z in np.round(d_z.to_value(apu.cm), 3)
         ]
-    fig = plt.figure(
+    fig = _get_figure(
+        fig,
         figsize=uv_ratio(u_data, v_data),
         constrained_layout=True
         )
 
-    gs = GridSpec(
-        nrows=2,
-        ncols=n_maps,
-        figure=fig,
-        )
-
-    ax = [plt.subplot(gs[i]) for i in range(n_maps*2)]
+    # beam maps in the first row and their colorbars in the second
+    ax, cax = fig.subplots(nrows=2, ncols=n_maps, squeeze=False)
     for i in range(n_maps):
         ax[i].set_yticklabels([])
 
-    cax = [ax[i + n_maps] for i in range(n_maps)]
-
     for i in range(n_maps):
         # new grid for beam_data
         u_ng = np.linspace(
@@ -296,13 +363,12 @@ def plot_beam_data(
             v_data[i, :].to(angle).max(),
             resolution
             )
-        beam_ng = interpolate.griddata(
-            # coordinates of grid points to interpolate from.
-            points=(u_data[i, :].to(angle), v_data[i, :].to(angle)),
-            values=beam_data[i, :],
-            # coordinates of grid points to interpolate to.
-            xi=tuple(np.meshgrid(u_ng, v_ng)),
-            method='cubic'
+        beam_ng = _interp_beam_data(
+            u=u_data[i, :].to_value(angle),
+            v=v_data[i, :].to_value(angle),
+            beam=beam_data[i, :],
+            u_ng=u_ng.to_value(angle),
+            v_ng=v_ng.to_value(angle)
             )
 
         vmin, vmax = beam_ng.min(), beam_ng.max()
@@ -319,14 +385,15 @@ def plot_beam_data(
             beam_ng,
             levels=levels,
             colors='k',
-            linewidths=0.4
+            linewidths=0.4,
+            algorithm='serial'
             )
 
         ax[i].set_xlabel(f'$u$ {angle}')
         ax[i].set_title(subtitle[i])
         ax[i].grid(False)
 
-        plt.colorbar(
+        fig.colorbar(
             im, cax=cax[i], orientation='horizontal', use_gridspec=True
             )
         cax[i].set_xlabel('Amplitude [arb]')
@@ -355,26 +422,37 @@ def plot_phase_difference(K1, K2, pr, piston, tilt, title, wavel):
         cbartitle = '$\\varphi(x, y)$ amplitude rad'
 
     extent = [-pr.to_value(apu.m), pr.to_value(apu.m)] * 2
-    _x1, _y1, _phase1 = phase(K_coeff=K1, pr=pr, tilt=tilt, piston=piston, wavel=wavel)
-    _x2, _y2, _phase2 = phase(K_coeff=K2, pr=pr, tilt=tilt, piston=piston, wavel=wavel)
-    print(_phase1)
-    print(_phase2)
-    _phase = _phase2-_phase1
-    levels = np.arange(floor(_phase.min().value), ceil(_phase.max().value), 0.2)  # radians
+    # the phase is linear in K_coeff, phase(K2) - phase(K1) = phase(K2 - K1),
+    # so the grid and the Zernike circle polynomials are evaluated only once.
+    # A lower order fit is padded with zeros, K(n, l) are sorted by order
+    N_K_coeff = max(np.size(K1), np.size(K2))
+    K_diff = (
+        np.pad(K2, (0, N_K_coeff - np.size(K2))) -
+        np.pad(K1, (0, N_K_coeff - np.size(K1)))
+        )
+    _x, _y, _phase = phase(
+        K_coeff=K_diff, pr=pr, tilt=tilt, piston=piston, wavel=wavel
+        )
+
+    # units are stripped once, plain arrays from here on
+    x_m, y_m = _x.to_value(apu.m), _y.to_value(apu.m)
+    _phase = _phase.to_value(apu.rad)
+    levels = np.arange(floor(_phase.min()), ceil(_phase.max()), 0.2)  # radians
     #levels = np.linspace(floor(_phase.min().value), ceil(_phase.max().value), 10)
     fig, ax = plt.subplots(figsize=(6, 5.8))
 
-    im = ax.imshow(X=_phase.to_value(apu.rad), extent=extent)
+    im = ax.imshow(X=_phase, extent=extent)
 
     # Partial solution for contour Warning
     with warnings.catch_warnings():
         countour = ax.contour(
-            _x1.to_value(apu.m),
-            _y1.to_value(apu.m),
-            _phase.to_value(apu.rad),
+            x_m,
+            y_m,
+            _phase,
             levels=levels,
             colors=["white"],
             alpha=0,
+            algorithm='serial',
             )
 
     divider = make_axes_locatable(ax)
@@ -390,7 +468,7 @@ def plot_phase_difference(K1, K2, pr, piston, tilt, title, wavel):
 
     #fig.tight_layout()
 
-    return fig, _phase
+    return fig, _phase << apu.rad
 
 from pyoof.aperture import phase
 import matplotlib.pyplot as plt
@@ -398,7 +476,7 @@ import warnings
 from mpl_toolkits.axes_grid1 import make_axes_locatable
 from math import ceil, floor
 
-def plot_phase(K_coeff, pr, piston, tilt, title, wavel):
+def plot_phase(K_coeff, pr, piston, tilt, title, wavel, fig=None):
     """
     Aperture phase distribution (phase-error), :math:`\\varphi(x, y)`, figure,
     given the Zernike circle polynomial coefficients, ``K_coeff``, solution
@@ -423,6 +501,9 @@ def plot_phase(K_coeff, pr, piston, tilt, title, wavel):
         :math:`U^1_1(\\varrho, \\varphi)`.
     title : `str`
         Figure title.
+    fig : `~matplotlib.figure.Figure`
+        Existing figure to be cleared and re-drawn, e.g. the output from a
+        previous call. Default is `None`, which creates a new figure.
 
     Returns
     -------
@@ -450,28 +531,34 @@ def plot_phase(K_coeff, pr, piston, tilt, title, wavel):
     
     extent = [-pr.to_value(apu.m), pr.to_value(apu.m)] * 2
     _x, _y, _phase = phase(K_coeff=K_coeff, pr=pr, tilt=tilt, piston=piston, wavel = wavel)
-    levels = np.arange(floor(_phase.min().value), ceil(_phase.max().value), 0.2)  # radians
+
+    # units are stripped once, plain arrays from here on
+    x_m, y_m = _x.to_value(apu.m), _y.to_value(apu.m)
+    _phase = _phase.to_value(apu.rad)
+    levels = np.arange(floor(_phase.min()), ceil(_phase.max()), 0.2)  # radians
     #levels = np.linspace(floor(_phase.min().value), ceil(_phase.max().value), 4)
-    fig, ax = plt.subplots(figsize=(6, 5.8))
-    im = ax.imshow(X=_phase.to_value(apu.rad), extent=extent)
+    fig = _get_figure(fig, figsize=(6, 5.8))
+    ax = fig.add_subplot()
+    im = ax.imshow(X=_phase, extent=extent)
     # Partial solution for contour Warning
     #with warnings.catch_warnings():
     #    warnings.simplefilter("ignore")
     with warnings.catch_warnings():
         warnings.simplefilter("ignore")
         countour = ax.contour(
-                _x.to_value(apu.m),
-                _y.to_value(apu.m),
-                _phase.to_value(apu.rad),
+                x_m,
+                y_m,
+                _phase,
                 levels=levels,
                 colors=["white"],
                 alpha=0,
+                algorithm='serial',
                 )
     divider = make_axes_locatable(ax)
     cax = divider.append_axes("right", size="3%", pad=0.03)
     cb = fig.colorbar(im, cax=cax)
     cb.ax.set_ylabel(cbartitle)
-    plt.clabel(countour, inline=True, fontsize=15, colors = "white")
+    ax.clabel(countour, inline=True, fontsize=15, colors = "white")
     ax.set_title(title)
     ax.set_ylabel('$y$ m')
     ax.set_xlabel('$x$ m')
@@ -504,26 +591,30 @@ def plot_phase_data(phase_data, pr, title):
         Aperture phase distribution represented for the telescope's primary
         reflector.
     """
-    _x = np.linspace(-pr, pr, phase_data.shape[0])
-    _y = np.linspace(-pr, pr, phase_data.shape[0])
+    # units are stripped once, plain arrays from here on
+    pr_m = pr.to_value(apu.m)
+    _x = np.linspace(-pr_m, pr_m, phase_data.shape[0])
+    _y = np.linspace(-pr_m, pr_m, phase_data.shape[0])
+    _phase_data = phase_data.to_value(apu.rad)
 
-    extent = [-pr.to_value(apu.m), pr.to_value(apu.m)] * 2
+    extent = [-pr_m, pr_m] * 2
     levels = np.linspace(-2, 2, 9)  # radians
 
     fig, ax = plt.subplots(figsize=(6, 5.8))
 
-    im = ax.imshow(X=phase_data.to_value(apu.rad), extent=extent)
+    im = ax.imshow(X=_phase_data, extent=extent)
 
     # Partial solution for contour Warning
     with warnings.catch_warnings():
         warnings.simplefilter("ignore")
         ax.contour(
-            _x.to_value(apu.m),
-            _y.to_value(apu.m),
-            phase_data.to_value(apu.rad),
+            _x,
+            _y,
+            _phase_data,
             levels=levels,
             colors='k',
-            alpha=0.3
+            alpha=0.3,
+            algorithm='serial'
             )
 
     divider = make_axes_locatable(ax)
@@ -570,9 +661,8 @@ def plot_variance(matrix, order, diag, cbtitle, title):
     """
     n = order
     N_K_coeff = (n + 1) * (n + 2) // 2
-    ln = [(j, i) for i in range(0, n + 1) for j in range(-i, i + 1, 2)]
-    L = np.array(ln)[:, 0]
-    N = np.array(ln)[:, 1]
+    # cached (n, l) table, same order as the K_coeff
+    N, L = _nl_indices(n).T
 
     params_names = [
         '$A_{E_\\mathrm{a}}$', '$c_\\mathrm{dB}$', 'q', '$x_0$', '$y_0$'
@@ -600,10 +690,10 @@ def plot_variance(matrix, order, diag, cbtitle, title):
         labels_x = params_names[params_used][:-1]
         labels_y = labels_x[::-1][:-1]
 
-    # selecting half covariance
-    mask = np.tri(_matrix.shape[0], k=k)
-    matrix_mask = np.ma.array(_matrix, mask=mask).T
-    # mask out the lower triangle
+    # selecting half covariance, the lower triangle is set to NaN which
+    # imshow draws with the (transparent) bad color of the colormap
+    mask = np.tri(_matrix.shape[0], k=k, dtype=bool)
+    matrix_mask = np.where(mask, np.nan, _matrix).T
 
     fig, ax = plt.subplots()
 
@@ -644,7 +734,7 @@ def plot_variance(matrix, order, diag, cbtitle, title):
 
 def plot_fit_path(
     path_pyoof_out, order, illum_func, telgeo,wavel,  angle='deg', plim=None,
-    save=False, i=0
+    save=False, i=0, figs=None
         ):
     """
     Plot all important figures after a least squares minimization.
@@ -673,28 +763,19 @@ def plot_fit_path(
     save : `bool`
         If `True`, it stores all plots in the ``'pyoof_out/directory'``
         directory.
+    figs : `dict`
+        Figures returned by a previous call, they are cleared and re-drawn
+        instead of creating new ones. Default is `None`.
 
     Returns
     -------
-    fig_beam : `~matplotlib.figure.Figure`
-        The three beam maps plotted from the input parameters. Each map with a
-        different offset :math:`d_z` value. From left to right, :math:`d_z^-`,
-        :math:`0` and :math:`d_z^+`.
-    fig_phase : `~matplotlib.figure.Figure`
-        Aperture phase distribution for the Zernike circle polynomials for the
-        telescope primary reflector.
-    fig_res : `~matplotlib.figure.Figure`
-        Figure from the three observed beam maps residual. Each map with a
-        different offset :math:`d_z` value. From left to right, :math:`d_z^-`,
-        :math:`0` and :math:`d_z^+`.
-    fig_data : `~matplotlib.figure.Figure`
-        Figure from the three observed beam maps. Each map with a different
-        offset :math:`d_z` value. From left to right, :math:`d_z^-`, :math:`0`
-        and :math:`d_z^+`.
-    fig_cov : `~matplotlib.figure.Figure`
-        Triangle figure representing Variance-Covariance matrix.
-    fig_corr : `~matplotlib.figure.Figure`
-        Triangle figure representing Correlation matrix.
+    figs : `dict`
+        Figures with keys ``'beam'``, the three fitted beam maps,
+        ``'phase'``, the aperture phase distribution, ``'res'``, the
+        residual of the three observed beam maps, and for ``order = 1``
+        ``'data'``, the three observed beam maps. Each beam map with a
+        different offset :math:`d_z` value, from left to right,
+        :math:`d_z^-`, :math:`0` and :math:`d_z^+`.
     """
 
     try:
@@ -705,7 +786,6 @@ def plot_fit_path(
         pass
 
     path_plot = os.path.join(path_pyoof_out, 'plots')
-    print(path_plot)
     if not os.path.exists(path_plot):
         os.makedirs(path_plot)
 
@@ -716,7 +796,7 @@ def plot_fit_path(
         )
 
     with open(os.path.join(path_pyoof_out, 'pyoof_info.yml'), 'r') as infile:
-        pyoof_info = yaml.load(infile, Loader=yaml.Loader)
+        pyoof_info = yaml.load(infile, Loader=_YAMLLoader)
 
     obs_object = pyoof_info['obs_object']
     meanel = round(pyoof_info['meanel'], 2)
@@ -724,11 +804,11 @@ def plot_fit_path(
     box_factor = pyoof_info['box_factor']
 
     # Beam and residual
-    beam_data = np.genfromtxt(os.path.join(path_pyoof_out, f'beam_data_{wavel}.csv'))
-    res = np.genfromtxt(os.path.join(path_pyoof_out, f'res_n{n}_{wavel}.csv'))
-    u_data = np.genfromtxt(
+    beam_data = np.loadtxt(os.path.join(path_pyoof_out, f'beam_data_{wavel}.csv'))
+    res = np.loadtxt(os.path.join(path_pyoof_out, f'res_n{n}_{wavel}.csv'))
+    u_data = np.loadtxt(
         os.path.join(path_pyoof_out, f'u_data_{wavel}.csv')) * apu.rad
-    v_data = np.genfromtxt(
+    v_data = np.loadtxt(
         os.path.join(path_pyoof_out, f'v_data_{wavel}.csv')) * apu.rad
     d_z = np.array(pyoof_info['d_z']) * apu.m
     pr = pyoof_info['pr'] * apu.m
@@ -736,10 +816,13 @@ def plot_fit_path(
     K_coeff = params['parfit'][5:]*apu.m
     #for u_data, v_data, beam_data in zip(u_data_array, v_data_array,beam_data_array):
     # Covariance and Correlation matrix
-    cov = np.genfromtxt(os.path.join(path_pyoof_out, f'cov_n{n}_{wavel}.csv'))
-    corr = np.genfromtxt(os.path.join(path_pyoof_out, f'corr_n{n}_{wavel}.csv'))
+    cov = np.loadtxt(os.path.join(path_pyoof_out, f'cov_n{n}_{wavel}.csv'))
+    corr = np.loadtxt(os.path.join(path_pyoof_out, f'corr_n{n}_{wavel}.csv'))
     wavel = pyoof_info['wavel'] * apu.m
 
+    if figs is None:
+        figs = {}
+
     if n == 1:
         fig_data = plot_beam_data(
             u_data=u_data,
@@ -749,8 +832,10 @@ def plot_fit_path(
             resolution=resolution,
             title='observed power pattern',
             angle=angle,
-            res_mode=False
+            res_mode=False,
+            fig=figs.get('data')
             )
+        figs['data'] = fig_data
 
     fig_beam = plot_beam(
         I_coeff=params['parfit'][:5],
@@ -763,7 +848,8 @@ def plot_fit_path(
         plim=plim,
         angle=angle,
         resolution=resolution,
-        box_factor=box_factor
+        box_factor=box_factor,
+        fig=figs.get('beam')
         )
 
     fig_phase = plot_phase(
@@ -772,7 +858,8 @@ def plot_fit_path(
         pr=pr,
         piston=False,
         tilt=False,
-        wavel = wavel
+        wavel = wavel,
+        fig=figs.get('phase')
         )
     fig_res = plot_beam_data(
         u_data=u_data,
@@ -782,8 +869,10 @@ def plot_fit_path(
         resolution=resolution,
         title='residual',
         angle=angle,
-        res_mode=True
+        res_mode=True,
+        fig=figs.get('res')
         )
+    figs.update(beam=fig_beam, phase=fig_phase, res=fig_res)
 
     if save:
         fig_beam.savefig(os.path.join(path_plot, f'fitbeam_n{n}_{i}.png'))
@@ -812,3 +901,5 @@ def plot_fit_path(
         diag=True,
         )
 """
+
+    return figs
@@ -3,12 +3,14 @@
 
 # Author: Tomas Cassanelli
 import numpy as np
+import io
 import os
 from astropy.time import Time
 from astropy import units as apu
 from astropy.constants import c as light_speed
 from astropy.io import fits
 from .aperture import radiation_pattern
+from .aux_functions import _data_pyoof
 
 __all__ = ['simulate_data_pyoof', "simulate_data_pyoof_multifreq"]
 
@@ -28,7 +30,8 @@ def simulate_data_pyoof_multifreq( I_coeff, K_coeff, wavel_array, d_z, illum_fun
 
 def simulate_data_pyoof(
     I_coeff, K_coeff, wavel, d_z, illum_func, telgeo, noise, resolution,
-    box_factor, work_dir=None, fits_name = "test", overwrite = True
+    box_factor, work_dir=None, fits_name = "test", overwrite = True,
+    dtype=np.complex128, return_data=False
         ):
     """
     Routine to generate data and test the pyoof package algorithm. It has the
@@ -81,6 +84,16 @@ def simulate_data_pyoof(
     work_dir : `str`
         Default is `None`, it will store the FITS file in the current
         directory, for other provide the desired path.
+    dtype : `~numpy.dtype`
+        Complex data type used for the (field) radiation pattern FFT2, see
+        `~pyoof.aperture.radiation_pattern`. Default is `~numpy.complex128`,
+        `~numpy.complex64` roughly doubles the FFT2 speed, enough for tests
+        since the beam maps are stored as single precision FITS columns.
+    return_data : `bool`
+        If `True` no FITS file is written, the data is returned in memory
+        with the same format as `~pyoof.extract_data_pyoof`, which saves the
+        file round trip when simulating and fitting in the same process.
+        Default is `False`.
 
     Returns
     -------
@@ -89,6 +102,10 @@ def simulate_data_pyoof(
         Every time the function is executed a new file will be stored (with
         increased numbering). The file is ready to use for the `~pyoof`
         package.
+    data : `dict`
+        Only if ``return_data=True``, instead of **pyoof_fits**. Same output
+        from `~pyoof.extract_data_pyoof` for the FITS file that would have
+        been stored.
 
     Raises
     ------
@@ -116,46 +133,29 @@ def simulate_data_pyoof(
         ] * apu.rad
     plim_u, plim_v = plim[:2], plim[2:]
 
-    # Generating power pattern and spatial frequencies
-    u, v, P = [], [], []
-    for i in range(len(d_z)):
-        _u, _v, _radiation = radiation_pattern(
-            K_coeff=K_coeff,
-            I_coeff=I_coeff,
-            d_z=d_z[i],
-            wavel=wavel,
-            illum_func=illum_func,
-            telgeo=telgeo,
-            resolution=resolution,
-            box_factor=box_factor
-            )
-
-        uu, vv = np.meshgrid(_u, _v)
-        power_pattern = np.abs(_radiation) ** 2
-
-        # trim the power pattern
-        power_pattern[(plim_u[0] > uu)] = np.nan
-        power_pattern[(plim_u[1] < uu)] = np.nan
-        power_pattern[(plim_v[0] > vv)] = np.nan
-        power_pattern[(plim_v[1] < vv)] = np.nan
-
-        power_trim_1d = power_pattern[~np.isnan(power_pattern)]
-        size_trim = int(np.sqrt(power_trim_1d.size))  # new size of the box
+    # Generating power pattern and spatial frequencies, all d_z maps share
+    # the aperture grid and are computed with a single batched FFT2
+    _u, _v, _radiation = radiation_pattern(
+        K_coeff=K_coeff,
+        I_coeff=I_coeff,
+        d_z=d_z,
+        wavel=wavel,
+        illum_func=illum_func,
+        telgeo=telgeo,
+        resolution=resolution,
+        box_factor=box_factor,
+        dtype=dtype
+        )
+    power_pattern = np.abs(_radiation) ** 2
 
- 
-        # Box to be trimmed in uu and vv meshed arrays
-        box = (
-            (plim_u[0] < uu) & (plim_u[1] > uu) &
-            (plim_v[0] < vv) & (plim_v[1] > vv)
-            )
+    # trim the power pattern, the box is the same for all maps
+    u_box = (plim_u[0] < _u) & (plim_u[1] > _u)
+    v_box = (plim_v[0] < _v) & (plim_v[1] > _v)
+    u_trim, v_trim = np.meshgrid(_u[u_box], _v[v_box])
 
-        # reshaping trimmed arrys
-        power_trim = power_trim_1d.reshape(size_trim, size_trim)
-        u_trim = uu[box].reshape(size_trim, size_trim)
-        v_trim = vv[box].reshape(size_trim, size_trim)
-        u.append(u_trim)
-        v.append(v_trim)
-        P.append(power_trim)
+    P = power_pattern[:, v_box][..., u_box]
+    u = [u_trim] * len(d_z)
+    v = [v_trim] * len(d_z)
 
     # adding noise!
     if noise == 0:
@@ -200,10 +200,6 @@ def simulate_data_pyoof(
     #    fits.Column(name='BEAM', format='E', array=p_to_save[2])
     #    ])
 
-    # storing data
-    if not os.path.exists(os.path.join(work_dir, 'data_generated')):
-        os.makedirs(os.path.join(work_dir, 'data_generated'))
-    
     name_file = os.path.join(work_dir, 'data_generated', fits_name + '.fits')
 
     prihdr = fits.Header()
@@ -226,6 +222,20 @@ def simulate_data_pyoof(
         #print("i:{},    d_z[i]:{}".format(i, d_z[i-1].to_value(apu.m)))
         pyoof_fits[i].header['DZ'] = d_z[i-1].to_value(apu.m)
         pyoof_fits[i].name = 'MINUS OOF'
-    pyoof_fits.writeto(name_file, overwrite = overwrite)
+
+    if return_data:
+        pthto = os.path.dirname(name_file)
+        return _data_pyoof(hdulist=pyoof_fits, name=fits_name, pthto=pthto)
+
+    # storing data
+    if not os.path.exists(os.path.join(work_dir, 'data_generated')):
+        os.makedirs(os.path.join(work_dir, 'data_generated'))
+
+    # the whole HDUList is serialized in memory and written with a single
+    # call, many small writes are slow on network file systems
+    buffer = io.BytesIO()
+    pyoof_fits.writeto(buffer)
+    with open(name_file, 'wb' if overwrite else 'xb') as fits_file:
+        fits_file.write(buffer.getbuffer())
 
     return pyoof_fits
@@ -2,6 +2,7 @@
 # -*- coding: utf-8 -*-
 
 # Author: Tomas Cassanelli
+from functools import lru_cache
 import numpy as np
 from astropy import units as apu
 from ..math_functions import line_equation
@@ -9,6 +10,33 @@ from ..math_functions import line_equation
 __all__ = ['opd_effelsberg', 'opd_manual', 'block_manual', 'block_effelsberg']
 
 
+def _opd_gregorian(x, y, d_z, Fp, F):
+    """
+    Cassegrain/Gregorian OPD function evaluated from the squared radius.
+    Since only :math:`a^2` and :math:`b^2` enter the expression, the square
+    root is never taken, and :math:`(1-a^2)/(1+a^2) = 2/(1+a^2) - 1` saves
+    further full-grid temporaries. Units are stripped once on entry, the
+    grid operations run on plain arrays in the units of :math:`d_z`.
+    """
+
+    unit = None
+    if type(d_z) == apu.quantity.Quantity:
+        unit = d_z.unit
+        d_z = d_z.value
+        x, y, Fp, F = (_q.to_value(unit) for _q in (x, y, Fp, F))
+
+    r2 = x ** 2 + y ** 2  # squared radial polar coordinate
+    a2 = r2 / (2 * Fp) ** 2
+    b2 = r2 / (2 * F) ** 2
+
+    opd = d_z * (2 / (1 + a2) + 2 / (1 + b2) - 2)
+
+    if unit is not None:
+        opd = opd << unit
+
+    return opd
+
+
 def opd_effelsberg(x, y, d_z):
     """
     Optical path difference (OPD) function, :math:`\\delta(x,y;d_z)`. Given by
@@ -53,13 +81,8 @@ def opd_effelsberg(x, y, d_z):
     # Cassegrain/Gregorian (at focus) telescope
     Fp = 30 * apu.m               # Focus primary reflector m
     F = 387.39435 * apu.m         # Total focus Gregorian telescope m
-    r = np.sqrt(x ** 2 + y ** 2)  # polar coordinates radius
-    a = r / (2 * Fp)
-    b = r / (2 * F)
-
-    opd = d_z * ((1 - a ** 2) / (1 + a ** 2) + (1 - b ** 2) / (1 + b ** 2))
 
-    return opd
+    return _opd_gregorian(x=x, y=y, d_z=d_z, Fp=Fp, F=F)
 
 
 def opd_manual(Fp, F):
@@ -87,15 +110,7 @@ def opd_manual(Fp, F):
 
     def opd_func(x, y, d_z):
         # Cassegrain/Gregorian (at focus) telescope
-        r = np.sqrt(x ** 2 + y ** 2)  # radial polar coordinate
-        a = r / (2 * Fp)
-        b = r / (2 * F)
-
-        opd = d_z * (
-            (1 - a ** 2) / (1 + a ** 2) + (1 - b ** 2) / (1 + b ** 2)
-            )
-
-        return opd
+        return _opd_gregorian(x=x, y=y, d_z=d_z, Fp=Fp, F=F)
 
     return opd_func
 
@@ -122,6 +137,22 @@ def block_effelsberg(alpha=20 * apu.deg):
     block_func : `function`
         Aperture (amplitude) distribution truncation, :math:`B(x, y)`. Values
         that are zero correspond to blocked values.
+
+    Notes
+    -----
+    The function is memoized on ``alpha``, the same ``block_func`` object is
+    returned for equal angles. Hence the grid and blockage caches in
+    `~pyoof.aperture.radiation_pattern`, which are keyed on ``block_dist``,
+    are shared across fits and simulations of the same telescope.
+    """
+
+    return _block_effelsberg(alpha)
+
+
+@lru_cache(maxsize=16)
+def _block_effelsberg(alpha):
+    """
+    Memoized `~pyoof.telgeometry.block_effelsberg`, keyed on ``alpha``.
     """
 
     # Default Effelsberg geometry
@@ -131,7 +162,7 @@ def block_effelsberg(alpha=20 * apu.deg):
     a = 1 * apu.m      # Half-width support structure
 
     def block_func(x, y):
-        block = np.zeros(x.shape)  # or y.shape same
+        block = np.zeros(np.broadcast(x, y).shape)  # x and y may broadcast
         block[(x ** 2 + y ** 2 < pr ** 2) & (x ** 2 + y ** 2 > sr ** 2)] = 1
 
         block[(-(sr + L) < x) & (x < (sr + L)) & (-a < y) & (y < a)] = 0
@@ -206,7 +237,7 @@ def block_manual(pr, sr, a, L):
     """
 
     def block_func(x, y):
-        block = np.zeros(x.shape)  # or y.shape same
+        block = np.zeros(np.broadcast(x, y).shape)  # x and y may broadcast
         block[(x ** 2 + y ** 2 < pr ** 2) & (x ** 2 + y ** 2 > sr ** 2)] = 1
         block[(-(sr + L) < x) & (x < (sr + L)) & (-a < y) & (y < a)] = 0
         block[(-(sr + L) < y) & (y < (sr + L)) & (-a < x) & (x < a)] = 0
@@ -3,6 +3,7 @@
 
 # Author: Tomas Cassanelli
 import pytest
+import os
 import numpy as np
 from numpy.testing import assert_allclose
 from astropy.tests.helper import assert_quantity_allclose
@@ -27,3 +28,54 @@ def test_uv_ratio():
 
     assert_allclose(width, width_true)
     assert_allclose(height, height_true)
+
+
+@pytest.mark.parametrize('order', [1, 2])
+def test_store_data_csv_binary(tmpdir, order):
+
+    # [beam_data, u_data, v_data, res, jac, grad, phase, cov, corr]
+    with NumpyRNGContext(0):
+        save_to_csv = [
+            np.random.normal(size=(3, 40)) for _ in range(3)
+            ] + [
+            np.random.normal(size=(3, 40)),
+            np.random.normal(size=(120, 8)),
+            np.random.normal(size=8),
+            np.random.normal(size=(16, 16)),
+            np.random.normal(size=(9, 8)),
+            np.random.normal(size=(9, 8))
+            ]
+
+    name_dir = str(tmpdir)
+    wavel = 0.0093685143125
+    for binary in [False, True]:
+        pyoof.store_data_csv(
+            name='test000',
+            name_dir=name_dir,
+            order=order,
+            wavel=wavel,
+            save_to_csv=save_to_csv,
+            binary=binary
+            )
+
+    fnames = [
+        f'beam_data_{wavel}.csv', f'u_data_{wavel}.csv', f'v_data_{wavel}.csv',
+        f'res_n{order}_{wavel}.csv', f'jac_n{order}_{wavel}.csv',
+        f'grad_n{order}_{wavel}.csv', f'phase_n{order}_{wavel}.csv',
+        f'cov_n{order}_{wavel}.csv', f'corr_n{order}_{wavel}.csv'
+        ]
+    keys = [
+        'beam_data', 'u_data', 'v_data', 'res', 'jac', 'grad', 'phase', 'cov',
+        'corr'
+        ]
+    if order != 1:
+        fnames, keys = fnames[3:], keys[3:]
+
+    with np.load(
+        os.path.join(name_dir, f'outputs_n{order}_{wavel}.npz')
+            ) as outputs:
+        assert sorted(outputs.files) == sorted(keys)
+
+        for fname, key in zip(fnames, keys):
+            data_csv = np.loadtxt(os.path.join(name_dir, fname))
+            assert_allclose(outputs[key], data_csv, rtol=1e-15)
@@ -9,13 +9,15 @@ import numpy as np
 from astropy import units as apu
 from astropy.utils.data import get_pkg_data_filename
 from astropy.table import Table
+from astropy.utils.misc import NumpyRNGContext
 from numpy.testing import assert_allclose
 import pyoof
+from pyoof.aux_functions import _YAMLLoader
 
 # initial configuration params same as the config_params.yml file
 config_params_pyoof = get_pkg_data_filename('../data/config_params.yml')
 with open(config_params_pyoof, 'r') as yaml_config:
-    config_params = yaml.load(yaml_config, Loader=yaml.Loader)
+    config_params = yaml.load(yaml_config, Loader=_YAMLLoader)
 
 n = 5                                           # initial order
 N_K_coeff = (n + 1) * (n + 2) // 2              # total numb. polynomials
@@ -23,25 +25,32 @@ wavel = 0.00862712109352518 * apu.m
 plus_minus = (2.6 * wavel).to_value(apu.cm)
 d_z = [-plus_minus, 0, plus_minus] * apu.cm
 
-# illumination parameters
-i_amp = np.random.uniform(.001, 1.1)
-c_dB = np.random.uniform(-21, -10) * apu.dB
-q = np.random.uniform(1, 2)
-x0 = np.random.uniform(-1, 1) * apu.cm
-y0 = np.random.uniform(-1, 1) * apu.cm
+# seeded draw, deterministic test (PYOOF_SEED changes the draw)
+with NumpyRNGContext(int(os.environ.get('PYOOF_SEED', 0))):
+    # illumination parameters, drawn at once [i_amp, c_dB, q, x0, y0]
+    _I_draw = np.random.uniform(
+        low=[.001, -21, 1, -1, -1], high=[1.1, -10, 2, 1, 1]
+        )
+    K_coeff = np.random.uniform(-.06, .06, N_K_coeff)
+
+i_amp = _I_draw[0]
+c_dB = _I_draw[1] * apu.dB
+q = _I_draw[2]
+x0 = _I_draw[3] * apu.cm
+y0 = _I_draw[4] * apu.cm
 
-K_coeff = np.random.uniform(-.06, .06, N_K_coeff)
 I_coeff = [i_amp, c_dB, q, x0, y0]
 
-I_coeff_dimensionless = [
-    I_coeff[0], I_coeff[1].to_value(apu.dB), I_coeff[2],
-    I_coeff[3].to_value(apu.m), I_coeff[4].to_value(apu.m)
-    ]
+# same draw in [1, dB, 1, m, m], a single cm -> m conversion factor
+cm_to_m = apu.cm.to(apu.m)
+I_coeff_dimensionless = _I_draw * [1, 1, 1, cm_to_m, cm_to_m]
 params = np.hstack((I_coeff_dimensionless, K_coeff))
 
 idx_exclude = config_params['excluded']
+fitted = np.ones(params.size, dtype=bool)
+fitted[idx_exclude] = False
 params_true = pyoof.params_complete(
-    params=np.delete(params, idx_exclude),
+    params=params[fitted],
     N_K_coeff=N_K_coeff,
     config_params=config_params
     )
@@ -55,6 +64,12 @@ I_coeff_true = [
 
 noise_level = 0                                # noise added to gen data
 
+# PYOOF_TEST_FAST=1 fits on a coarser grid, same tolerances
+if os.environ.get('PYOOF_TEST_FAST', '0') == '1':
+    fit_resolution, fit_box_factor = 2 ** 7, 4
+else:
+    fit_resolution, fit_box_factor = 2 ** 8, 5
+
 effelsberg_telescope = [
     pyoof.telgeometry.block_effelsberg(alpha=10 * apu.deg),  # blockage
     pyoof.telgeometry.opd_effelsberg,           # OPD function
@@ -70,7 +85,8 @@ def pyoof_tmp_dir(tmpdir_factory):
 
     tdir = str(tmpdir_factory.mktemp('fit_zpoly'))
 
-    pyoof.simulate_data_pyoof(
+    # simulated data is kept in memory, no FITS file round trip
+    data = pyoof.simulate_data_pyoof(
         K_coeff=K_coeff_true,
         I_coeff=I_coeff_true,
         wavel=wavel,
@@ -80,14 +96,21 @@ def pyoof_tmp_dir(tmpdir_factory):
         noise=noise_level,
         resolution=2 ** 9,
         box_factor=6.5,
-        work_dir=tdir
+        work_dir=tdir,
+        fits_name='test000',
+        dtype=np.complex64,
+        return_data=True
         )
 
     print('temp directory: ', tdir)
 
-    # Reading the generated data
-    pathfits = os.path.join(tdir, 'data_generated', 'test000.fits')
-    data_info, data_obs = pyoof.extract_data_pyoof(pathfits)
+    data_info = [
+        data[key] for key in [
+            'name', 'pthto', 'obs_object', 'obs_date', 'freq', 'wavel', 'd_z',
+            'meanel'
+            ]
+        ]
+    data_obs = [data['beam_data'], data['u_data'], data['v_data']]
 
     pyoof.fit_zpoly(
         data_info=data_info,
@@ -96,8 +119,8 @@ def pyoof_tmp_dir(tmpdir_factory):
         illum_func=illum_func,
         telescope=effelsberg_telescope,
         fit_previous=True,
-        resolution=2 ** 8,
-        box_factor=5,
+        resolution=fit_resolution,
+        box_factor=fit_box_factor,
         config_params_file=None,
         verbose=0,
         make_plots=False,
@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Author: Tomas Cassanelli
+import pytest
+import numpy as np
+from numpy.testing import assert_allclose
+from scipy import interpolate
+from astropy import units as apu
+from astropy.utils.misc import NumpyRNGContext
+import matplotlib.pyplot as plt
+from pyoof.aperture import phase
+from pyoof.plot_routines import _interp_beam_data, plot_phase_difference
+
+
+@pytest.mark.parametrize('amplitude', [1, 1e-7])
+def test_interp_beam_data(amplitude):
+
+    # rectilinear beam map, shuffled as in the FITS files
+    u = np.linspace(-3e-4, 3e-4, 60)
+    v = np.linspace(-3e-4, 3e-4, 50)
+    uu, vv = np.meshgrid(u, v)
+    beam = amplitude * np.sinc(uu / 1e-4) * np.sinc(vv / 1.3e-4)
+    with NumpyRNGContext(0):
+        idx = np.random.permutation(beam.size)
+
+    u_ng = np.linspace(u.min(), u.max(), 128)
+    v_ng = np.linspace(v.min(), v.max(), 128)
+
+    beam_ng = _interp_beam_data(
+        uu.ravel()[idx], vv.ravel()[idx], beam.ravel()[idx], u_ng, v_ng
+        )
+    beam_ng_true = interpolate.griddata(
+        points=(uu.ravel(), vv.ravel()),
+        values=beam.ravel(),
+        xi=tuple(np.meshgrid(u_ng, v_ng)),
+        method='cubic'
+        )
+
+    # small (residual) maps are not flattened to zero
+    assert beam_ng.shape == (128, 128)
+    assert_allclose(beam_ng, beam_ng_true, rtol=0, atol=2e-3 * amplitude)
+    assert np.ptp(beam_ng) > 0.9 * np.ptp(beam)
+
+
+def test_plot_phase_difference():
+
+    pr = 50 * apu.m
+    wavel = 0.0093685143125 * apu.m
+
+    # fits of different order, n = 4 and n = 5
+    with NumpyRNGContext(0):
+        K1 = np.random.normal(0., .05, 15) * wavel
+        K2 = np.random.normal(0., .05, 21) * wavel
+
+    for K_a, K_b in [(K1, K2), (K2, K1)]:
+        fig, _phase = plot_phase_difference(
+            K1=K_a, K2=K_b, pr=pr, piston=False, tilt=False, title='',
+            wavel=wavel
+            )
+        plt.close(fig)
+
+        _phase_a = phase(
+            K_coeff=K_a, pr=pr, piston=False, tilt=False, wavel=wavel
+            )[2]
+        _phase_b = phase(
+            K_coeff=K_b, pr=pr, piston=False, tilt=False, wavel=wavel
+            )[2]
+        _phase_true = _phase_b - _phase_a
+
+        assert_allclose(
+            _phase.to_value(apu.rad), _phase_true.to_value(apu.rad),
+            rtol=0, atol=1e-12
+            )
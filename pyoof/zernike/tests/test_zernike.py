@@ -39,3 +39,27 @@ def test_U():
 
     assert_allclose(_U_cos, U_cos_true)
     assert_allclose(_U_sin, U_sin_true)
+
+
+def test_R_stack():
+
+    _R_stack = pyoof.zernike.R_stack(n=7, rho=r)
+
+    for (n, m), _R in _R_stack.items():
+        assert_allclose(_R, pyoof.zernike.R(n=n, m=m, rho=r), atol=1e-12)
+
+
+def test_U_stack():
+
+    _U_stack = pyoof.zernike.U_stack(n=7, rho=r, theta=t)
+    nl = [(i, j) for i in range(0, 8) for j in range(-i, i + 1, 2)]
+
+    with pytest.raises(TypeError):
+        pyoof.zernike.U_stack(n=7.1, rho=r, theta=t)
+
+    assert _U_stack.shape == (len(nl), ) + r.shape
+    for k, (n, l) in enumerate(nl):
+        assert_allclose(
+            _U_stack[k, ...], pyoof.zernike.U(n=n, l=l, rho=r, theta=t),
+            atol=1e-12
+            )
@@ -3,11 +3,12 @@
 
 # Author: Tomas Cassanelli
 import numpy as np
+from functools import lru_cache
 from math import factorial as f
 
 
 __all__ = [
-    'U', 'R'
+    'U', 'R', 'R_stack', 'U_stack'
     ]
 
 
@@ -44,7 +45,9 @@ def R(n, m, rho):
         varrho^2 \\right)^{\\frac{n+m}{2}} \\cdot  \\left( \\varrho^2 -1
         \\right)^{\\frac{n-m}{2}} \\right\\},
 
-    Which can also be expressed as a polynomial sum.
+    Which can also be expressed as a polynomial sum. Here the sum is written
+    as :math:`R^m_n(\\varrho) = \\varrho^m Q(\\varrho^2)`, and the polynomial
+    :math:`Q` is evaluated with the Horner scheme.
 
     Examples
     --------
@@ -55,18 +58,21 @@ def R(n, m, rho):
     >>> from pyoof import zernike
     >>> # only orthogonal under unitary circle
     >>> r = np.linspace(-10, 10, 5) * u.m
-    >>> zernike.R(n=4, m=2, rho=r / r.max())
+    >>> zernike.R(n=4, m=2, rho=r / r.max())  # doctest: +FLOAT_CMP
     <Quantity [ 1. , -0.5,  0. , -0.5,  1. ]>
     """
 
-    a = (n + m) // 2
-    b = (n - m) // 2
+    # R^m_n = rho^m Q(rho^2), Q is evaluated with the Horner scheme
+    coeff = _R_coeff(n, m)
+    rho2 = rho * rho
 
-    radial_poly = sum(
-        (-1) ** s * f(n - s) * rho ** (n - 2 * s) /
-        (f(s) * f(a - s) * f(b - s))
-        for s in range(0, b + 1)
-        )
+    radial_poly = np.full_like(rho2, coeff[0], dtype=float)
+    for c in coeff[1:]:
+        radial_poly = radial_poly * rho2 + c
+
+    # rho^m by repeated multiplication
+    for _ in range(m):
+        radial_poly = radial_poly * rho
 
     return radial_poly
 
@@ -130,7 +136,7 @@ def U(n, l, rho, theta):
     >>> from pyoof import zernike, cart2pol
     >>> x = np.linspace(-10, 10, 5) * u.m
     >>> r, t = cart2pol(x, x)  # polar coordinates
-    >>> zernike.U(n=4, l=-2, rho=r / r.max(), theta=t)
+    >>> zernike.U(n=4, l=-2, rho=r / r.max(), theta=t)  # doctest: +FLOAT_CMP
     <Quantity [ 1. , -0.5,  0. , -0.5,  1. ]>
     """
 
@@ -150,3 +156,182 @@ def U(n, l, rho, theta):
         zernike_circle_poly = radial * np.cos(m * theta)
 
     return zernike_circle_poly
+
+
+def R_stack(n, rho):
+    """
+    Radial Zernike polynomials, :math:`R^m_n(\\varrho)`, for all the allowed
+    :math:`(n, m)` pairs up to order ``n``. Instead of expanding every
+    polynomial from its factorial sum, they are generated with the Kintner
+    three-term recurrence relation, re-using the lower orders for each fixed
+    :math:`m`. Used to compute the full set of Zernike circle polynomials,
+    `~pyoof.zernike.U_stack`.
+
+    Parameters
+    ----------
+    n : `int`
+        It is :math:`n \\geqslant 0`. Maximum order of the radial component.
+    rho : `~numpy.ndarray`
+        Values for the radial component, :math:`\\varrho = \\sqrt{x^2 + y^2}`.
+
+    Returns
+    -------
+    radial_stack : `dict`
+        Radial Zernike polynomials already evaluated, :math:`R^m_n(\\varrho)`,
+        with keys ``(n, m)``.
+
+    Notes
+    -----
+    The first two polynomials for each :math:`m` are :math:`R^m_m = \\varrho^m`
+    and :math:`R^m_{m+2} = (m + 2)\\varrho^{m+2} - (m + 1)\\varrho^m`, the
+    higher orders follow from,
+
+    .. math::
+        k_1 R^m_n(\\varrho) = \\left(k_2 \\varrho^2 + k_3\\right)
+        R^m_{n-2}(\\varrho) + k_4 R^m_{n-4}(\\varrho),
+
+    .. math::
+        k_1 = \\frac{(n + m)(n - m)(n - 2)}{2}, \\qquad
+        k_2 = 2n(n - 1)(n - 2),
+
+    .. math::
+        k_3 = -m^2(n - 1) - n(n - 1)(n - 2), \\qquad
+        k_4 = -\\frac{n(n + m - 2)(n - m - 2)}{2}.
+    """
+
+    rho2 = rho * rho
+
+    # powers of rho computed by repeated multiplication
+    rho_pow = [np.ones_like(rho)]
+    for m in range(1, n + 1):
+        rho_pow.append(rho_pow[-1] * rho)
+
+    radial_stack = {}
+    for m in range(0, n + 1):
+        radial_stack[(m, m)] = rho_pow[m]
+
+        if m + 2 <= n:
+            radial_stack[(m + 2, m)] = (
+                (m + 2) * rho_pow[m] * rho2 - (m + 1) * rho_pow[m]
+                )
+
+        for _n in range(m + 4, n + 1, 2):
+            k1 = (_n + m) * (_n - m) * (_n - 2) / 2
+            k2 = 2 * _n * (_n - 1) * (_n - 2)
+            k3 = -m ** 2 * (_n - 1) - _n * (_n - 1) * (_n - 2)
+            k4 = -_n * (_n + m - 2) * (_n - m - 2) / 2
+
+            radial_stack[(_n, m)] = (
+                (k2 * rho2 + k3) * radial_stack[(_n - 2, m)] +
+                k4 * radial_stack[(_n - 4, m)]
+                ) / k1
+
+    return radial_stack
+
+
+def U_stack(n, rho, theta):
+    """
+    Full set of Zernike circle polynomials, :math:`U^\\ell_n(\\varrho,
+    \\vartheta)`, up to order ``n``. Same as evaluating
+    `~pyoof.zernike.U` for every allowed :math:`(n, \\ell)` pair, but the
+    radial polynomials are shared through `~pyoof.zernike.R_stack` and the
+    angular components, :math:`\\cos m\\vartheta` and :math:`\\sin
+    m\\vartheta`, are computed only once per :math:`m` using the Chebyshev
+    recurrence. The total number of polynomials is given by :math:`(n + 1)(n
+    + 2) / 2.`
+
+    Parameters
+    ----------
+    n : `int`
+        It is :math:`n \\geqslant 0`. Maximum order of the radial component.
+    rho : `~numpy.ndarray`
+        Values for the radial component. :math:`\\varrho = \\sqrt{x^2 + y^2}`.
+    theta : `~numpy.ndarray`
+        Values for the angular component. For a rectangular grid x and y are
+        evaluated as :math:`\\vartheta = \\mathrm{arctan}(y / x)`.
+
+    Returns
+    -------
+    zernike_stack : `~numpy.ndarray`
+        Zernike circle polynomials already evaluated, with shape
+        ``(N_K_coeff, *rho.shape)``. They follow the same order as the
+        Zernike circle polynomial coefficients, :math:`K_{n\\ell}`, i.e.
+        ``[(n, l) for n in range(0, n + 1) for l in range(-n, n + 1, 2)]``.
+
+    Raises
+    ------
+    `TypeError`
+        If the order ``n`` is not a positive integer.
+    """
+
+    if not (n >= 0 and isinstance(n, int)):
+        raise TypeError('Polynomial order (n) has to be a positive integer')
+
+    N_K_coeff = (n + 1) * (n + 2) // 2
+    zernike_stack = np.empty((N_K_coeff,) + np.shape(rho))
+
+    for k, (radial, angular) in enumerate(_U_factors(n, rho, theta)):
+        np.multiply(radial, angular, out=zernike_stack[k, ...])
+
+    return zernike_stack
+
+
+def _U_factors(n, rho, theta):
+    """
+    Radial and angular factors of the Zernike circle polynomials up to order
+    ``n``, yielded one :math:`(n, \\ell)` pair at a time in the
+    `~pyoof.zernike.U_stack` order. The polynomial is the product of both
+    factors, so a weighted sum can be accumulated without storing the full
+    stack.
+    """
+
+    radial = R_stack(n, rho)
+
+    # cos(m theta) and sin(m theta) from the Chebyshev recurrence
+    cos_t, sin_t = np.cos(theta), np.sin(theta)
+    cos_m = [np.ones_like(cos_t), cos_t]
+    sin_m = [np.zeros_like(sin_t), sin_t]
+    for m in range(2, n + 1):
+        cos_m.append(2 * cos_t * cos_m[-1] - cos_m[-2])
+        sin_m.append(2 * cos_t * sin_m[-1] - sin_m[-2])
+
+    for _n, l in _nl_indices(n).tolist():
+        m = abs(l)
+        if l < 0:
+            yield radial[(_n, m)], sin_m[m]
+        else:
+            yield radial[(_n, m)], cos_m[m]
+
+
+@lru_cache(maxsize=None)
+def _R_coeff(n, m):
+    """
+    Integer coefficients of the radial Zernike polynomial,
+    :math:`R^m_n(\\varrho)`, sorted by decreasing power of
+    :math:`\\varrho`. The factorials are evaluated once per ``(n, m)`` pair.
+    """
+
+    a = (n + m) // 2
+    b = (n - m) // 2
+
+    return tuple(
+        (-1) ** s * f(n - s) // (f(s) * f(a - s) * f(b - s))
+        for s in range(0, b + 1)
+        )
+
+
+@lru_cache(maxsize=None)
+def _nl_indices(n):
+    """
+    Read-only array with the ``(n, l)`` pairs of all Zernike circle
+    polynomials up to order ``n``, in the same order as the coefficients
+    :math:`K_{n\\ell}`. Shape ``(N_K_coeff, 2)``.
+    """
+
+    nl = np.array(
+        [(_n, l) for _n in range(0, n + 1) for l in range(-_n, _n + 1, 2)],
+        dtype=int
+        )
+    nl.setflags(write=False)
+
+    return nl
@@ -2,7 +2,18 @@
 # -*- coding: utf-8 -*-
 
 # Author: Tomas Cassanelli
+import os
+import sys
 import numpy as np
+import matplotlib
+
+# headless (no X11/Wayland display), skip the GUI backend discovery
+headless = sys.platform.startswith('linux') and not (
+    os.environ.get('DISPLAY') or os.environ.get('WAYLAND_DISPLAY')
+    )
+if headless:
+    matplotlib.use('Agg')
+
 import matplotlib.pyplot as plt
 from astropy import units as u
 import pyoof
@@ -57,4 +68,5 @@ fig = pyoof.plot_beam_data(
     res_mode=False
     )
 
-plt.show()
\ No newline at end of file
+if not headless:
+    plt.show()